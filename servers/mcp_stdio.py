@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+MCP stdio transport helpers
+===========================
+
+Line-oriented JSON-RPC plumbing shared by youtube_mcp.py and
+youtube_mcp_enhanced.py: reading request lines from stdin without blocking
+the event loop, the worker tasks that handle queued requests, and writing
+whole response frames to stdout.
+
+Keep this file next to the servers that import it.
+"""
+
+import asyncio
+import logging
+import os
+import select
+import sys
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+async def open_stdin_reader(loop: asyncio.AbstractEventLoop, limit: int) -> Optional[Tuple[asyncio.ReadTransport, asyncio.StreamReader]]:
+    """Attach stdin to the event loop, or return None where that isn't dependable."""
+    if sys.platform == 'win32':
+        # The Proactor loop can accept a synchronous stdin pipe and then fail or
+        # stall once reads start, so Windows always reads through a worker thread
+        return None
+    reader = asyncio.StreamReader(limit=limit)
+    # The transport gets its own descriptor, so closing it leaves sys.stdin usable
+    # for the worker-thread fallback
+    pipe = os.fdopen(os.dup(sys.stdin.fileno()), 'rb', buffering=0)
+    try:
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    except (NotImplementedError, OSError, ValueError) as e:
+        pipe.close()
+        logger.info("Reading stdin through a worker thread: %s", e)
+        return None
+    return transport, reader
+
+async def stdin_line_reader(limit: int) -> Callable[[], Awaitable[bytes]]:
+    """
+    Return a coroutine function that reads one request line from stdin.
+    Lines come straight off the event loop where stdin can be attached as a
+    pipe; otherwise, or once a pipe read fails, each line is read with a
+    blocking readline in the default executor. A line longer than `limit`
+    raises ValueError from the pipe reader and is discarded.
+    """
+    loop = asyncio.get_running_loop()
+    attached = await open_stdin_reader(loop, limit)
+
+    def executor_readline() -> Awaitable[bytes]:
+        return loop.run_in_executor(None, sys.stdin.buffer.readline)
+
+    if attached is None:
+        return executor_readline
+
+    async def read_line() -> bytes:
+        nonlocal attached
+        if attached is not None:
+            transport, reader = attached
+            try:
+                return await reader.readline()
+            except (OSError, NotImplementedError) as e:
+                logger.info("stdin pipe read failed, reading through a worker thread: %s", e)
+                attached = None
+                transport.close()
+                # The pipe transport made the shared descriptor non-blocking
+                os.set_blocking(sys.stdin.fileno(), True)
+        return await executor_readline()
+
+    return read_line
+
+async def request_worker(server: Any, queue: "asyncio.Queue[bytes]") -> None:
+    """Pass queued request lines to server.handle_message one at a time; several workers run side by side"""
+    while True:
+        line = await queue.get()
+        try:
+            await server.handle_message(line)
+        finally:
+            queue.task_done()
+
+def write_all(stream: Any, data: Any) -> None:
+    """
+    Write every byte of data to stream and flush it. A non-blocking stdout
+    (the pipe can be shared with stdin once that is attached to the event loop)
+    may take only part of a frame, return None or raise BlockingIOError; each
+    of those waits until the descriptor is writable and carries on from the
+    first unwritten byte, so a frame is never truncated or dropped.
+    """
+    with memoryview(data) as view:
+        pending = view
+        while pending:
+            try:
+                written = stream.write(pending)
+            except BlockingIOError as e:
+                written = e.characters_written
+            if not written:
+                select.select([], [stream], [])
+                continue
+            pending = pending[written:]
+        pending.release()
+    while True:
+        try:
+            stream.flush()
+            return
+        except BlockingIOError:
+            select.select([], [stream], [])
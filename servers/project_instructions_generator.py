@@ -19,10 +19,43 @@ Enhanced: June 18, 2025 - Complete instruction evolution system
 import json
 import sys
 import asyncio
+import logging
 import os
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pre-rendered JSON-RPC error envelopes; only the id and message are filled in per reply
+ERR_METHOD_NOT_FOUND = b'{"jsonrpc":"2.0","id":%s,"error":{"code":-32601,"message":%s}}'
+ERR_INTERNAL = b'{"jsonrpc":"2.0","id":%s,"error":{"code":-32603,"message":%s}}'
+ERR_PARSE = b'{"jsonrpc":"2.0","id":null,"error":{"code":-32700,"message":%s}}'
+RESULT_ENVELOPE = b'{"jsonrpc":"2.0","id":%s,"result":%s}'
+TEXT_RESULT_ENVELOPE = b'{"jsonrpc":"2.0","id":%s,"result":{"content":[{"type":"text","text":%s}]}}'
+
+SYNC_TIMESTAMP_FORMAT = '%B %d, %Y at %I:%M %p'
+
+# stdout carries the protocol, so failures are reported through logging (stderr by default)
+logger = logging.getLogger(__name__)
+_now = datetime.now
+
+def _dumps(obj):
+    """Serialize a value to compact JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _result(req_id, result):
+    """Render a JSON-RPC success reply"""
+    return RESULT_ENVELOPE % (_dumps(req_id), _dumps(result))
+
+def _text_result(req_id, text):
+    """Render a tools/call reply carrying a single text content block"""
+    return TEXT_RESULT_ENVELOPE % (_dumps(req_id), _dumps(text))
+
 class ProjectInstructionsGenerator:
     def __init__(self):
         self.name = "project-instructions-generator"
@@ -537,198 +570,222 @@ This provides updated condensed instructions for Claude Desktop project knowledg
             "sync_reason": sync_reason
         }
 
-    def save_project_instructions(self, content, project_topic):
-        """Save generated instructions to a file"""
+    def project_instructions_path(self, project_topic):
+        """Return the file path generated instructions for a topic are saved to"""
         filename = f"{project_topic.lower().replace(' ', '_')}_project_instructions.md"
-        filepath = self.base_path / "project_instructions" / filename
-        
-        # Create directory if it doesn't exist
-        filepath.parent.mkdir(exist_ok=True)
-        
-        try:
-            with open(filepath, 'w', encoding='utf-8', errors='ignore') as f:
-                f.write(content)
-            return str(filepath)
-        except Exception as e:
-            return f"Error saving file: {e}"
+        return self.base_path / "project_instructions" / filename
 
-    def save_sync_instructions(self, content):
-        """Save synchronization instructions to a file"""
+    def sync_instructions_path(self):
+        """Return a timestamped file path for synchronization instructions"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"claude_desktop_sync_{timestamp}.md"
-        filepath = self.base_path / "project_instructions" / filename
-        
-        # Create directory if it doesn't exist
-        filepath.parent.mkdir(exist_ok=True)
-        
+        return self.base_path / "project_instructions" / filename
+
+    def write_instructions(self, filepath, content, error_prefix="Error saving file"):
+        """Write instructions to filepath, returning the path or an error message"""
         try:
+            # Create directory if it doesn't exist
+            filepath.parent.mkdir(exist_ok=True)
             with open(filepath, 'w', encoding='utf-8', errors='ignore') as f:
                 f.write(content)
             return str(filepath)
         except Exception as e:
-            return f"Error saving sync file: {e}"
+            return f"{error_prefix}: {e}"
+
+    def save_project_instructions(self, content, project_topic):
+        """Save generated instructions to a file"""
+        return self.write_instructions(self.project_instructions_path(project_topic), content)
+
+    def save_sync_instructions(self, content):
+        """Save synchronization instructions to a file"""
+        return self.write_instructions(self.sync_instructions_path(), content, "Error saving sync file")
+
+# Tool definitions advertised by tools/list, built once at import
+_TOOL_SCHEMA = [
+    {
+        "name": "generate_project_instructions",
+        "description": "Generate customized project instructions that preserve knowledge base and cognitive optimization",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "project_topic": {
+                    "type": "string",
+                    "description": "Main topic/name of the project"
+                },
+                "project_description": {
+                    "type": "string", 
+                    "description": "Detailed description of what the project aims to accomplish"
+                },
+                "project_goals": {
+                    "type": "string",
+                    "description": "Specific goals and success criteria (optional)"
+                },
+                "save_file": {
+                    "type": "boolean",
+                    "description": "Whether to save the instructions to a file (default: true)",
+                    "default": True
+                }
+            },
+            "required": ["project_topic", "project_description"]
+        }
+    },
+    {
+        "name": "generate_claude_desktop_sync",
+        "description": "Generate condensed project instructions for Claude Desktop project knowledge synchronization",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "current_desktop_content": {
+                    "type": "string",
+                    "description": "Current content in Claude Desktop project knowledge area"
+                },
+                "sync_reason": {
+                    "type": "string",
+                    "description": "Reason for synchronization (new capabilities, major updates, etc.)"
+                },
+                "save_file": {
+                    "type": "boolean",
+                    "description": "Whether to save the sync instructions to a file (default: true)",
+                    "default": True
+                }
+            },
+            "required": ["current_desktop_content"]
+        }
+    },
+    {
+        "name": "read_knowledge_summary",
+        "description": "Read and summarize current knowledge base for project context",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "analyze_project_instructions",
+        "description": "Analyze existing project instructions for improvement opportunities",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "instruction_content": {
+                    "type": "string",
+                    "description": "Current project instruction content to analyze"
+                }
+            },
+            "required": ["instruction_content"]
+        }
+    },
+    {
+        "name": "upgrade_project_instructions",
+        "description": "Intelligently merge new capabilities into existing project instructions",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "instruction_content": {
+                    "type": "string",
+                    "description": "Current project instruction content to upgrade"
+                },
+                "new_capabilities": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of new capabilities to integrate"
+                }
+            },
+            "required": ["instruction_content", "new_capabilities"]
+        }
+    },
+    {
+        "name": "generate_claude_desktop_update_strategy",
+        "description": "Generate deployment assistance with change highlights for Claude Desktop updates",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "current_desktop_content": {
+                    "type": "string",
+                    "description": "Current content in Claude Desktop project knowledge area"
+                },
+                "new_capabilities": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of new capabilities being added"
+                },
+                "deployment_priority": {
+                    "type": "string",
+                    "description": "Deployment priority level (high, medium, low)",
+                    "default": "high"
+                }
+            },
+            "required": ["current_desktop_content", "new_capabilities"]
+        }
+    }
+]
+_TOOLS_LIST_RESULT = _dumps({"tools": _TOOL_SCHEMA})
 
 class MCPServer:
     def __init__(self):
         self.generator = ProjectInstructionsGenerator()
+        # Background writes still running; held so they are not dropped before they finish
+        self._pending_saves = set()
+        
+    def _save_in_background(self, filepath, content, error_prefix="Error saving file"):
+        """Schedule an instructions write on the default executor and return its target path"""
+        target = str(filepath)
+        future = asyncio.get_running_loop().run_in_executor(
+            None, self.generator.write_instructions, filepath, content, error_prefix
+        )
+        self._pending_saves.add(future)
+        
+        def report(done):
+            self._pending_saves.discard(done)
+            try:
+                outcome = done.result()
+            except Exception as e:
+                logger.error("%s: %s", error_prefix, e)
+                return
+            # write_instructions returns the path on success and an error message otherwise
+            if outcome != target:
+                logger.error("%s", outcome)
+        
+        future.add_done_callback(report)
+        return target
         
     async def handle_request(self, request):
         """Handle MCP requests"""
         try:
-            if request.get("method") == "initialize":
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": {
-                        "protocolVersion": "2024-11-05",
-                        "capabilities": {
-                            "tools": {}
-                        },
-                        "serverInfo": {
-                            "name": self.generator.name,
-                            "version": self.generator.version
-                        }
-                    }
-                }
+            req_get = request.get
+            method = req_get("method")
+            req_id = req_get("id")
+            gen = self.generator
             
-            elif request.get("method") == "tools/list":
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "result": {
-                        "tools": [
-                            {
-                                "name": "generate_project_instructions",
-                                "description": "Generate customized project instructions that preserve knowledge base and cognitive optimization",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "project_topic": {
-                                            "type": "string",
-                                            "description": "Main topic/name of the project"
-                                        },
-                                        "project_description": {
-                                            "type": "string", 
-                                            "description": "Detailed description of what the project aims to accomplish"
-                                        },
-                                        "project_goals": {
-                                            "type": "string",
-                                            "description": "Specific goals and success criteria (optional)"
-                                        },
-                                        "save_file": {
-                                            "type": "boolean",
-                                            "description": "Whether to save the instructions to a file (default: true)",
-                                            "default": True
-                                        }
-                                    },
-                                    "required": ["project_topic", "project_description"]
-                                }
-                            },
-                            {
-                                "name": "generate_claude_desktop_sync",
-                                "description": "Generate condensed project instructions for Claude Desktop project knowledge synchronization",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "current_desktop_content": {
-                                            "type": "string",
-                                            "description": "Current content in Claude Desktop project knowledge area"
-                                        },
-                                        "sync_reason": {
-                                            "type": "string",
-                                            "description": "Reason for synchronization (new capabilities, major updates, etc.)"
-                                        },
-                                        "save_file": {
-                                            "type": "boolean",
-                                            "description": "Whether to save the sync instructions to a file (default: true)",
-                                            "default": True
-                                        }
-                                    },
-                                    "required": ["current_desktop_content"]
-                                }
-                            },
-                            {
-                                "name": "read_knowledge_summary",
-                                "description": "Read and summarize current knowledge base for project context",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {},
-                                    "required": []
-                                }
-                            },
-                            {
-                                "name": "analyze_project_instructions",
-                                "description": "Analyze existing project instructions for improvement opportunities",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "instruction_content": {
-                                            "type": "string",
-                                            "description": "Current project instruction content to analyze"
-                                        }
-                                    },
-                                    "required": ["instruction_content"]
-                                }
-                            },
-                            {
-                                "name": "upgrade_project_instructions",
-                                "description": "Intelligently merge new capabilities into existing project instructions",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "instruction_content": {
-                                            "type": "string",
-                                            "description": "Current project instruction content to upgrade"
-                                        },
-                                        "new_capabilities": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "List of new capabilities to integrate"
-                                        }
-                                    },
-                                    "required": ["instruction_content", "new_capabilities"]
-                                }
-                            },
-                            {
-                                "name": "generate_claude_desktop_update_strategy",
-                                "description": "Generate deployment assistance with change highlights for Claude Desktop updates",
-                                "inputSchema": {
-                                    "type": "object",
-                                    "properties": {
-                                        "current_desktop_content": {
-                                            "type": "string",
-                                            "description": "Current content in Claude Desktop project knowledge area"
-                                        },
-                                        "new_capabilities": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "List of new capabilities being added"
-                                        },
-                                        "deployment_priority": {
-                                            "type": "string",
-                                            "description": "Deployment priority level (high, medium, low)",
-                                            "default": "high"
-                                        }
-                                    },
-                                    "required": ["current_desktop_content", "new_capabilities"]
-                                }
-                            }
-                        ]
+            if method == "initialize":
+                return _result(req_id, {
+                    "protocolVersion": "2024-11-05",
+                    "capabilities": {
+                        "tools": {}
+                    },
+                    "serverInfo": {
+                        "name": gen.name,
+                        "version": gen.version
                     }
-                }
+                })
             
-            elif request.get("method") == "tools/call":
-                tool_name = request.get("params", {}).get("name")
-                arguments = request.get("params", {}).get("arguments", {})
+            elif method == "tools/list":
+                return RESULT_ENVELOPE % (_dumps(req_id), _TOOLS_LIST_RESULT)
+            
+            elif method == "tools/call":
+                params = req_get("params", {})
+                tool_name = params.get("name")
+                arguments = params.get("arguments", {})
+                args_get = arguments.get
                 
                 if tool_name == "generate_project_instructions":
-                    project_topic = arguments.get("project_topic")
-                    project_description = arguments.get("project_description") 
-                    project_goals = arguments.get("project_goals")
-                    save_file = arguments.get("save_file", True)
+                    project_topic = args_get("project_topic")
+                    project_description = args_get("project_description") 
+                    project_goals = args_get("project_goals")
+                    save_file = args_get("save_file", True)
                     
                     # Generate instructions
-                    instructions = self.generator.generate_project_instructions(
+                    instructions = gen.generate_project_instructions(
                         project_topic, project_description, project_goals
                     )
                     
@@ -739,32 +796,26 @@ class MCPServer:
                     
                     # Save to file if requested
                     if save_file:
-                        filepath = self.generator.save_project_instructions(instructions, project_topic)
+                        filepath = self._save_in_background(
+                            gen.project_instructions_path(project_topic), instructions
+                        )
                         result["saved_to"] = filepath
                     
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": f"Generated project instructions for '{project_topic}'\n\n{instructions}\n\n" + 
-                                           (f"Saved to: {result.get('saved_to')}" if save_file else "Instructions generated (not saved)")
-                                }
-                            ]
-                        }
-                    }
+                    return _text_result(
+                        req_id,
+                        f"Generated project instructions for '{project_topic}'\n\n{instructions}\n\n" +
+                        (f"Saved to: {result.get('saved_to')}" if save_file else "Instructions generated (not saved)")
+                    )
                 
                 elif tool_name == "generate_claude_desktop_sync":
-                    current_content = arguments.get("current_desktop_content")
-                    sync_reason = arguments.get("sync_reason", "Knowledge base synchronization update")
-                    save_file = arguments.get("save_file", True)
+                    current_content = args_get("current_desktop_content")
+                    sync_reason = args_get("sync_reason", "Knowledge base synchronization update")
+                    save_file = args_get("save_file", True)
                     
                     # Generate sync analysis and recommendations
-                    sync_result = self.generator.generate_claude_desktop_sync(current_content, sync_reason)
+                    sync_result = gen.generate_claude_desktop_sync(current_content, sync_reason)
                     
-                    result = sync_result.copy()
+                    result = sync_result
                     
                     # Save to file if requested
                     if save_file:
@@ -780,132 +831,75 @@ class MCPServer:
 {sync_reason}
 
 ---
-*Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}*"""
+*Generated: {_now().strftime(SYNC_TIMESTAMP_FORMAT)}*"""
                         
-                        filepath = self.generator.save_sync_instructions(sync_content)
+                        filepath = self._save_in_background(
+                            gen.sync_instructions_path(), sync_content, "Error saving sync file"
+                        )
                         result["saved_to"] = filepath
                     
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": f"Claude Desktop Synchronization Analysis\n\n{sync_result['analysis']}\n\nCondensed Instructions for Claude Desktop:\n\n{sync_result['condensed_instructions']}\n\n" + 
-                                           (f"Saved to: {result.get('saved_to')}" if save_file else "Analysis generated (not saved)")
-                                }
-                            ]
-                        }
-                    }
+                    return _text_result(
+                        req_id,
+                        f"Claude Desktop Synchronization Analysis\n\n{sync_result['analysis']}\n\nCondensed Instructions for Claude Desktop:\n\n{sync_result['condensed_instructions']}\n\n" +
+                        (f"Saved to: {result.get('saved_to')}" if save_file else "Analysis generated (not saved)")
+                    )
                 
                 elif tool_name == "read_knowledge_summary":
-                    summary = self.generator.read_knowledge_summary()
+                    summary = gen.read_knowledge_summary()
                     
-                    return {
-                        "jsonrpc": "2.0", 
-                        "id": request.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": summary
-                                }
-                            ]
-                        }
-                    }
+                    return _text_result(req_id, summary)
                 
                 elif tool_name == "analyze_project_instructions":
-                    instruction_content = arguments.get("instruction_content")
+                    instruction_content = args_get("instruction_content")
                     
-                    analysis = self.generator.analyze_project_instructions(instruction_content)
+                    analysis = gen.analyze_project_instructions(instruction_content)
                     
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": analysis
-                                }
-                            ]
-                        }
-                    }
+                    return _text_result(req_id, analysis)
                 
                 elif tool_name == "upgrade_project_instructions":
-                    instruction_content = arguments.get("instruction_content")
-                    new_capabilities = arguments.get("new_capabilities")
+                    instruction_content = args_get("instruction_content")
+                    new_capabilities = args_get("new_capabilities")
                     
-                    upgraded = self.generator.upgrade_project_instructions(instruction_content, new_capabilities)
+                    upgraded = gen.upgrade_project_instructions(instruction_content, new_capabilities)
                     
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": upgraded
-                                }
-                            ]
-                        }
-                    }
+                    return _text_result(req_id, upgraded)
                 
                 elif tool_name == "generate_claude_desktop_update_strategy":
-                    current_desktop_content = arguments.get("current_desktop_content")
-                    new_capabilities = arguments.get("new_capabilities")
-                    deployment_priority = arguments.get("deployment_priority", "high")
+                    current_desktop_content = args_get("current_desktop_content")
+                    new_capabilities = args_get("new_capabilities")
+                    deployment_priority = args_get("deployment_priority", "high")
                     
-                    strategy = self.generator.generate_claude_desktop_update_strategy(
+                    strategy = gen.generate_claude_desktop_update_strategy(
                         current_desktop_content, new_capabilities, deployment_priority
                     )
                     
-                    return {
-                        "jsonrpc": "2.0",
-                        "id": request.get("id"),
-                        "result": {
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": strategy
-                                }
-                            ]
-                        }
-                    }
+                    return _text_result(req_id, strategy)
             
             # Handle other standard MCP methods
-            elif request.get("method") == "notifications/initialized":
+            elif method == "notifications/initialized":
                 return None  # No response needed for notifications
             
             else:
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get("id"),
-                    "error": {
-                        "code": -32601,
-                        "message": f"Method not found: {request.get('method')}"
-                    }
-                }
+                return ERR_METHOD_NOT_FOUND % (_dumps(req_id), _dumps(f"Method not found: {method}"))
                 
         except Exception as e:
-            return {
-                "jsonrpc": "2.0",
-                "id": request.get("id"),
-                "error": {
-                    "code": -32603,
-                    "message": f"Internal error: {str(e)}"
-                }
-            }
+            return ERR_INTERNAL % (_dumps(request.get("id")), _dumps(f"Internal error: {str(e)}"))
+
+def write_message(payload):
+    """Write one newline-terminated JSON-RPC message to stdout in a single write"""
+    out = sys.stdout.buffer
+    out.write(payload + b"\n")
+    out.flush()
 
 async def main():
     """Main server loop"""
     server = MCPServer()
+    loop = asyncio.get_running_loop()
     
     while True:
         try:
             # Read request from stdin
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
+            line = await loop.run_in_executor(None, sys.stdin.readline)
             if not line:
                 break
                 
@@ -913,20 +907,13 @@ async def main():
             response = await server.handle_request(request)
             
             if response:
-                print(json.dumps(response), flush=True)
+                write_message(response)
                 
-        except json.JSONDecodeError:
-            continue
+        except json.JSONDecodeError as e:
+            # Reply instead of dropping the frame so the client is not left waiting
+            write_message(ERR_PARSE % _dumps(f"Parse error: {str(e)}"))
         except Exception as e:
-            error_response = {
-                "jsonrpc": "2.0",
-                "id": None,
-                "error": {
-                    "code": -32700,
-                    "message": f"Parse error: {str(e)}"
-                }
-            }
-            print(json.dumps(error_response), flush=True)
+            write_message(ERR_PARSE % _dumps(f"Parse error: {str(e)}"))
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -8,11 +8,22 @@ import json
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add current directory to path
 sys.path.append(os.path.dirname(__file__))
 
 from deepseek_mcp_fixed import DeepSeekMCPServer
 
+def j(obj):
+    """Pretty-print a JSON value with 2-space indentation"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
 async def test_deepseek_server():
     """Test DeepSeek server responses to identify JSON-RPC issues"""
     
@@ -32,9 +43,9 @@ async def test_deepseek_server():
         }
     }
     
-    response = await server.handle_request(init_request)
-    print(f"Request: {json.dumps(init_request, indent=2)}")
-    print(f"Response: {json.dumps(response, indent=2)}")
+    response1 = await server.handle_request(init_request)
+    print(f"Request: {j(init_request)}")
+    print(f"Response: {j(response1)}")
     print()
     
     # Test 2: Tools list request  
@@ -45,9 +56,9 @@ async def test_deepseek_server():
         "method": "tools/list"
     }
     
-    response = await server.handle_request(tools_request)
-    print(f"Request: {json.dumps(tools_request, indent=2)}")
-    print(f"Response: {json.dumps(response, indent=2)}")
+    response2 = await server.handle_request(tools_request)
+    print(f"Request: {j(tools_request)}")
+    print(f"Response: {j(response2)}")
     print()
     
     # Test 3: Simple tool call
@@ -64,18 +75,14 @@ async def test_deepseek_server():
         }
     }
     
-    response = await server.handle_request(tool_request)
-    print(f"Request: {json.dumps(tool_request, indent=2)}")
-    print(f"Response: {json.dumps(response, indent=2)}")
+    response3 = await server.handle_request(tool_request)
+    print(f"Request: {j(tool_request)}")
+    print(f"Response: {j(response3)}")
     print()
     
     # Validation checks
     print("=== JSON-RPC Protocol Validation ===")
-    responses = [
-        await server.handle_request(init_request),
-        await server.handle_request(tools_request), 
-        await server.handle_request(tool_request)
-    ]
+    responses = [response1, response2, response3]
     
     for i, resp in enumerate(responses, 1):
         print(f"\nResponse {i} Validation:")
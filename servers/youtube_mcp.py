@@ -18,21 +18,85 @@ Protocol: JSON-RPC 2.0 compatible (2024-11-05)
 """
 
 import asyncio
+import functools
+import importlib
+import io
 import json
 import logging
 import os
 import re
+import string
 import subprocess
 import sys
+import tempfile
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, Iterable, List, Optional, Tuple, Any, Union
+
+from mcp_stdio import request_worker, stdin_line_reader, write_all
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize one newline-terminated JSON-RPC frame."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj).encode('utf-8') + b"\n"
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# HTTP session shared by every youtube-transcript-api request (1.x releases only)
+_HTTP_SESSION = None
+
+def _new_transcript_client() -> Any:
+    """
+    Build the client used for every transcript lookup.
+    1.x releases are instantiated once around a shared requests session so
+    connections are reused across extractions; older releases only offer
+    class methods, so the class itself is the client.
+    """
+    global _HTTP_SESSION
+    if not hasattr(YouTubeTranscriptApi, 'list'):
+        return YouTubeTranscriptApi
+    import requests
+    _HTTP_SESSION = requests.Session()
+    return YouTubeTranscriptApi(http_client=_HTTP_SESSION)
+
+# Checked once at import so initialize only shells out to pip when something is missing
+try:
+    from youtube_transcript_api import YouTubeTranscriptApi
+    from youtube_transcript_api.formatters import TextFormatter
+    _FORMATTER = TextFormatter()
+    _TRANSCRIPT_CLIENT = _new_transcript_client()
+except ImportError:
+    YouTubeTranscriptApi = None
+    _FORMATTER = None
+    _TRANSCRIPT_CLIENT = None
+
+try:
+    import yt_dlp  # noqa: F401
+    _DEPS_OK = _FORMATTER is not None
+except ImportError:
+    _DEPS_OK = False
 
 # Setup logging
 log_file = r"C:\Users\ruben\Claude Tools\logs\youtube_mcp.log"
 os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
+# Quiet by default; set YOUTUBE_MCP_DEBUG to log every extraction step
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.INFO if os.environ.get('YOUTUBE_MCP_DEBUG') else logging.WARNING,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(log_file, encoding='utf-8')
@@ -40,60 +104,141 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns shared by the extraction and checklist helpers
+_VIDEO_ID_RE = re.compile(r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})')
+_ID_CHARSET = frozenset(string.ascii_letters + string.digits + '_-')
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+_FILLER_RE = re.compile(r'\b(um|uh|you know|like|basically|actually)\b', re.IGNORECASE)
+_SAFE_ID_RE = re.compile(r'[^\w\-_]')
+_SEGMENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|\n+')
+
+# Keyword vocabularies used to classify transcript content
+_INSTRUCTION_KEYWORDS = (
+    'how to', 'step', 'first', 'next', 'then', 'now', 'let\'s', 'you need to',
+    'make sure', 'important', 'remember', 'tutorial', 'guide', 'process',
+    'install', 'setup', 'configure', 'build', 'create', 'add', 'remove'
+)
+_ACTION_KEYWORDS = frozenset({
+    'install', 'download', 'create', 'open', 'click', 'add', 'remove',
+    'setup', 'configure', 'build', 'run', 'execute', 'make', 'set',
+    'copy', 'paste', 'save', 'delete', 'move', 'edit', 'change'
+})
+_POSITIVE_WORDS = frozenset({'good', 'great', 'awesome', 'excellent', 'love', 'like', 'impressed', 'solid'})
+_NEGATIVE_WORDS = frozenset({'bad', 'terrible', 'hate', 'disappointing', 'issues', 'problems', 'buggy'})
+_FEATURE_WORDS = frozenset({'feature', 'system', 'mechanic', 'graphics', 'sound', 'gameplay', 'story'})
+_REVIEW_WORDS = _POSITIVE_WORDS | _NEGATIVE_WORDS | _FEATURE_WORDS
+_REVIEW_TOPIC_WORDS = frozenset({'game', 'graphics', 'sound', 'story', 'gameplay', 'combat', 'building', 'features'})
+_IMPORTANT_INDICATORS = frozenset({'important', 'key', 'main', 'essential', 'critical', 'remember', 'note'})
+
+def _keyword_re(words: Iterable[str]) -> re.Pattern:
+    """Compile a vocabulary into one case-insensitive alternation of word stems.
+
+    A match must start on a word boundary but may carry a suffix, so inflected
+    forms such as "installing", "clicked" or "creates" still count.
+    """
+    return re.compile(r'\b(?:' + '|'.join(sorted(words)) + r')\w*', re.IGNORECASE)
+
+# One regex pass per segment instead of tokenizing it and intersecting with a set
+_ACTION_RE = _keyword_re(_ACTION_KEYWORDS)
+_REVIEW_RE = _keyword_re(_REVIEW_WORDS)
+_IMPORTANT_RE = _keyword_re(_IMPORTANT_INDICATORS)
+
+# Successful extractions keyed by video ID, least recently used first
+_TRANSCRIPT_CACHE_SIZE = 128
+_transcript_cache: "OrderedDict[str, Tuple[str, Any, str]]" = OrderedDict()
+
+# Successful extractions also persist on disk so they survive server restarts
+TRANSCRIPT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'youtube-mcp')
+TRANSCRIPT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Header of saved transcript files; title_line is either empty or a full "Title: ...\n" line
+_SEP = "=" * 50
+_HEADER_TMPL = (
+    "YouTube Video Transcript\n"
+    "========================\n\n"
+    "Video ID: {vid}\n"
+    "{title_line}"
+    "URL: {url}\n"
+    "Extraction Method: {method}\n"
+    "Extracted: {ts}\n\n"
+    "TRANSCRIPT:\n"
+    + _SEP + "\n\n"
+)
+# Characters of transcript text encoded and written per call
+TRANSCRIPT_WRITE_CHUNK = 64 * 1024
+
+# Maximum number of videos processed at once by a batch (urls) tool call
+BATCH_CONCURRENCY = 8
+
+# Responses are buffered and flushed once per event loop pass; the buffer is
+# reused between flushes and only reallocated after growing past the cap
+STDOUT_BUFFER_SIZE = 64 * 1024
+STDOUT_BUFFER_MAX = 128 * 1024
+# Requests handled concurrently by the main loop
+REQUEST_WORKERS = 8
+# Tool results with more text than this are JSON-encoded off the event loop
+LARGE_RESPONSE_CHARS = 64 * 1024
+# Longest request line accepted from stdin
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
 def install_dependencies():
     """Install required dependencies including yt-dlp fallback."""
     required_packages = ['youtube-transcript-api', 'yt-dlp']
     
+    # Check installed distributions by metadata instead of importing the packages
+    missing = []
     for package in required_packages:
         try:
-            if package == 'youtube-transcript-api':
-                __import__('youtube_transcript_api')
-            elif package == 'yt-dlp':
-                __import__('yt_dlp')
-        except ImportError:
-            logger.info(f"Installing {package}...")
-            try:
-                # Redirect stdout and stderr to prevent interfering with JSON-RPC
-                subprocess.check_call([sys.executable, '-m', 'pip', 'install', package], 
-                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                logger.info(f"{package} installed successfully!")
-            except Exception as e:
-                logger.warning(f"Could not install {package}: {e}")
+            version(package)
+        except PackageNotFoundError:
+            missing.append(package)
+    
+    if not missing:
+        return
+    
+    logger.info("Installing %s...", ', '.join(missing))
+    try:
+        # Redirect stdout and stderr to prevent interfering with JSON-RPC
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', *missing], 
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        importlib.invalidate_caches()
+        logger.info("%s installed successfully!", ', '.join(missing))
+    except Exception as e:
+        logger.warning("Could not install %s: %s", ', '.join(missing), e)
 
+@functools.lru_cache(maxsize=4096)
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from various URL formats."""
     url = url.strip()
     
-    patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})',
-        r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]{11})',
-        r'(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-        r'(?:https?://)?(?:www\.)?youtube\.com/v/([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
+    # Bare IDs are the common case for API callers and never look like a URL
+    if len(url) == 11 and _ID_CHARSET.issuperset(url):
         return url
     
-    return None
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
     """
     Primary method: Use youtube-transcript-api (faster when it works).
     Returns: (transcript_text, transcript_data, method_used)
     """
+    global YouTubeTranscriptApi, _FORMATTER, _TRANSCRIPT_CLIENT
     try:
-        from youtube_transcript_api import YouTubeTranscriptApi
-        from youtube_transcript_api.formatters import TextFormatter
+        if _FORMATTER is None:
+            # Not importable at startup; install_dependencies may have added it since
+            from youtube_transcript_api import YouTubeTranscriptApi
+            from youtube_transcript_api.formatters import TextFormatter
+            _FORMATTER = TextFormatter()
+            _TRANSCRIPT_CLIENT = _new_transcript_client()
         
         logger.info("Trying youtube-transcript-api...")
         
         # Get transcript list
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        if _TRANSCRIPT_CLIENT is YouTubeTranscriptApi:
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+        else:
+            transcript_list = _TRANSCRIPT_CLIENT.list(video_id)
         
         # Try to get English transcript (manual first, then auto-generated)
         transcript = None
@@ -117,7 +262,7 @@ def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optiona
         if transcript is None:
             for available_transcript in transcript_list:
                 transcript = available_transcript
-                logger.info(f"Using {available_transcript.language} transcript")
+                logger.info("Using %s transcript", available_transcript.language)
                 break
         
         if transcript is None:
@@ -126,24 +271,32 @@ def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optiona
         
         # Fetch and format
         transcript_data = transcript.fetch()
-        formatter = TextFormatter()
-        transcript_text = formatter.format_transcript(transcript_data)
+        transcript_text = _FORMATTER.format_transcript(transcript_data)
         
-        logger.info(f"SUCCESS! Extracted {len(transcript_text)} characters")
+        logger.info("SUCCESS! Extracted %d characters", len(transcript_text))
         return transcript_text, transcript_data, "youtube-transcript-api"
         
     except Exception as e:
         error_str = str(e)
-        logger.info(f"Primary method failed: {error_str}")
+        logger.info("Primary method failed: %s", error_str)
         
         if "no element found" in error_str:
             logger.info("Detected XML parsing error - this is the known issue")
         
         return None, None, f"primary_failed_{type(e).__name__}"
 
+def find_vtt_subtitle_url(info: Dict[str, Any]) -> Optional[str]:
+    """Return the URL of an English VTT track, preferring manual subtitles over automatic captions."""
+    for key in ('subtitles', 'automatic_captions'):
+        for track in (info.get(key) or {}).get('en') or []:
+            if track.get('ext') == 'vtt' and track.get('url'):
+                return track['url']
+    return None
+
 def get_transcript_fallback_method(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
     """
     Fallback method: Use yt-dlp (more robust, handles YouTube changes).
+    Subtitles are fetched straight into memory rather than written to disk.
     Returns: (transcript_text, transcript_data, method_used)
     """
     try:
@@ -158,60 +311,35 @@ def get_transcript_fallback_method(video_id: str) -> Tuple[Optional[str], Option
         
         # Setup yt-dlp options
         ydl_opts = {
-            'writesubtitles': True,
-            'writeautomaticsub': True,
-            'subtitleslangs': ['en'],
-            'subtitlesformat': 'vtt',
             'skip_download': True,
             'quiet': True,
             'no_warnings': True,
             'no_color': True,
             'extractor_args': {'youtube': {'player_client': ['android']}},
+            'socket_timeout': 30,
         }
         
-        # Create temporary directory for subtitle files
-        temp_dir = os.path.join(os.getcwd(), 'temp_subs')
-        os.makedirs(temp_dir, exist_ok=True)
-        ydl_opts['outtmpl'] = os.path.join(temp_dir, f'{video_id}.%(ext)s')
-        
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             try:
-                logger.info("Downloading subtitles with yt-dlp...")
-                ydl.download([f'https://www.youtube.com/watch?v={video_id}'])
+                logger.info("Fetching subtitle tracks with yt-dlp...")
+                info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=False)
             except Exception as e:
-                logger.info(f"yt-dlp download failed: {str(e)}")
+                logger.info("yt-dlp extraction failed: %s", e)
                 return None, None, f"fallback_failed_download_{type(e).__name__}"
-        
-        # Look for subtitle files
-        subtitle_files = []
-        for file in os.listdir(temp_dir):
-            if file.startswith(video_id) and file.endswith('.vtt'):
-                subtitle_files.append(os.path.join(temp_dir, file))
-        
-        if not subtitle_files:
-            logger.info("No subtitle files found")
-            # Cleanup
+            
+            subtitle_url = find_vtt_subtitle_url(info or {})
+            if not subtitle_url:
+                logger.info("No English VTT subtitles found")
+                return None, None, "fallback_failed_no_subtitle_files"
+            
+            # Fetch through yt-dlp so the request carries its headers, cookies and proxy
+            # settings, and parse the VTT content line by line as it streams in
             try:
-                for file in os.listdir(temp_dir):
-                    os.remove(os.path.join(temp_dir, file))
-                os.rmdir(temp_dir)
-            except:
-                pass
-            return None, None, "fallback_failed_no_subtitle_files"
-        
-        # Read the first subtitle file
-        subtitle_file = subtitle_files[0]
-        logger.info(f"Reading subtitle file: {os.path.basename(subtitle_file)}")
-        
-        try:
-            with open(subtitle_file, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-        except Exception as e:
-            logger.info(f"Could not read subtitle file: {str(e)}")
-            return None, None, f"fallback_failed_read_{type(e).__name__}"
-        
-        # Parse VTT content
-        transcript_text = parse_vtt_content(vtt_content)
+                with ydl.urlopen(subtitle_url) as response:
+                    transcript_text = parse_vtt_content(io.TextIOWrapper(response, encoding='utf-8'))
+            except Exception as e:
+                logger.info("Could not fetch subtitles: %s", e)
+                return None, None, f"fallback_failed_read_{type(e).__name__}"
         
         if not transcript_text:
             logger.info("Could not parse VTT content")
@@ -220,65 +348,141 @@ def get_transcript_fallback_method(video_id: str) -> Tuple[Optional[str], Option
         # Create transcript data (simplified format)
         transcript_data = [{"text": transcript_text, "start": 0.0}]
         
-        # Cleanup temp files
-        try:
-            for file in os.listdir(temp_dir):
-                os.remove(os.path.join(temp_dir, file))
-            os.rmdir(temp_dir)
-        except:
-            pass
-        
-        logger.info(f"SUCCESS! Extracted {len(transcript_text)} characters using yt-dlp")
+        logger.info("SUCCESS! Extracted %d characters using yt-dlp", len(transcript_text))
         return transcript_text, transcript_data, "yt-dlp"
         
     except Exception as e:
-        logger.info(f"Fallback method unexpected error: {str(e)}")
+        logger.info("Fallback method unexpected error: %s", e)
         return None, None, f"fallback_failed_unexpected_{type(e).__name__}"
 
-def parse_vtt_content(vtt_content: str) -> Optional[str]:
-    """Parse VTT (WebVTT) subtitle content and extract text."""
-    lines = vtt_content.split('\n')
+def parse_vtt_content(vtt_content: Union[str, Iterable[str]]) -> Optional[str]:
+    """
+    Parse VTT (WebVTT) subtitle content and extract text.
+    Accepts the whole document as a string or any iterable of lines,
+    such as an open file, so large files never need to be held in full.
+    """
+    lines = vtt_content.splitlines() if isinstance(vtt_content, str) else vtt_content
     text_parts = []
+    in_cue = False
     
     for line in lines:
         line = line.strip()
         
-        # Skip VTT headers, timestamps, and empty lines
-        if (line.startswith('WEBVTT') or 
-            line.startswith('NOTE') or
-            '-->' in line or
-            line.isdigit() or
-            not line):
+        # A timestamp line opens a cue and a blank line closes it; headers,
+        # NOTE blocks and cue numbers all sit outside cue text
+        if '-->' in line:
+            in_cue = True
+            continue
+        if not line:
+            in_cue = False
+            continue
+        if not in_cue:
             continue
         
         # Remove VTT styling tags
-        line = re.sub(r'<[^>]+>', '', line)
+        if '<' in line:
+            line = _VTT_TAG_RE.sub('', line)
         
         if line:
             text_parts.append(line)
     
     return ' '.join(text_parts) if text_parts else None
 
-def get_transcript_robust(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
+def _cache_transcript(video_id: str, result: Tuple[str, Any, str]) -> Tuple[str, Any, str]:
+    """Store a successful extraction, evicting the least recently used entry when full."""
+    _transcript_cache[video_id] = result
+    _transcript_cache.move_to_end(video_id)
+    if len(_transcript_cache) > _TRANSCRIPT_CACHE_SIZE:
+        _transcript_cache.popitem(last=False)
+    return result
+
+def _disk_cache_path(video_id: str) -> str:
+    return os.path.join(TRANSCRIPT_CACHE_DIR, f"{_SAFE_ID_RE.sub('_', video_id)}.json")
+
+def load_cached_transcript(video_id: str) -> Optional[Tuple[str, Any, str]]:
+    """Read a transcript from the disk cache, or None if it is missing or expired."""
+    cache_file = _disk_cache_path(video_id)
+    try:
+        if time.time() - os.path.getmtime(cache_file) > TRANSCRIPT_CACHE_TTL:
+            return None
+        with open(cache_file, 'rb') as f:
+            entry = _loads(f.read())
+        return entry['text'], entry['data'], entry['method']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def store_cached_transcript(video_id: str, result: Tuple[str, Any, str]) -> None:
+    """Write a successful extraction to the disk cache; failures are only logged."""
+    transcript_text, transcript_data, method = result
+    entry = {'text': transcript_text, 'data': transcript_data, 'method': method}
+    try:
+        try:
+            payload = _dumps(entry)
+        except TypeError:
+            # Library transcript objects are not JSON serializable; keep the text-only shape
+            entry['data'] = [{"text": transcript_text, "start": 0.0}]
+            payload = _dumps(entry)
+        
+        os.makedirs(TRANSCRIPT_CACHE_DIR, exist_ok=True)
+        cache_file = _disk_cache_path(video_id)
+        # A unique temp file per writer: worker threads may store the same video at once
+        fd, temp_file = tempfile.mkstemp(dir=TRANSCRIPT_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_file, cache_file)
+        except BaseException:
+            os.unlink(temp_file)
+            raise
+    except Exception as e:
+        logger.warning("Could not write transcript cache: %s", e)
+
+async def remember_transcript(video_id: str, result: Tuple[str, Any, str]) -> Tuple[str, Any, str]:
+    """Add a successful extraction to both the memory and the disk cache."""
+    await asyncio.to_thread(store_cached_transcript, video_id, result)
+    return _cache_transcript(video_id, result)
+
+async def get_transcript_robust(video_id: str, force_refresh: bool = False) -> Tuple[Optional[str], Optional[Dict], str]:
     """
     Robust transcript extraction with primary method + fallback.
+    Both methods run concurrently in worker threads and the first one to
+    return a transcript wins; the primary result is preferred on a tie.
+    Successful results are cached in memory and on disk per video ID;
+    force_refresh skips both caches and extracts again.
     Returns: (transcript_text, transcript_data, method_used)
     """
-    logger.info(f"Starting robust transcript extraction for {video_id}")
+    if not force_refresh:
+        cached = _transcript_cache.get(video_id)
+        if cached is not None:
+            _transcript_cache.move_to_end(video_id)
+            logger.info("Using cached transcript for %s", video_id)
+            return cached
+        
+        cached = await asyncio.to_thread(load_cached_transcript, video_id)
+        if cached is not None:
+            logger.info("Using disk-cached transcript for %s", video_id)
+            return _cache_transcript(video_id, cached)
     
-    # Try primary method first
-    transcript_text, transcript_data, method = get_transcript_primary_method(video_id)
+    logger.info("Starting robust transcript extraction for %s", video_id)
     
-    if transcript_text:
-        return transcript_text, transcript_data, method
+    primary = asyncio.ensure_future(asyncio.to_thread(get_transcript_primary_method, video_id))
+    fallback = asyncio.ensure_future(asyncio.to_thread(get_transcript_fallback_method, video_id))
+    pending = {primary, fallback}
     
-    logger.info("Primary method failed, trying fallback...")
-    
-    # Try fallback method
-    transcript_text, transcript_data, method = get_transcript_fallback_method(video_id)
-    
-    if transcript_text:
-        return transcript_text, transcript_data, method
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (primary, fallback):
+                if task not in done:
+                    continue
+                transcript_text, transcript_data, method = task.result()
+                if transcript_text:
+                    return await remember_transcript(video_id, (transcript_text, transcript_data, method))
+                logger.info("Transcript method failed: %s", method)
+    finally:
+        # The losing method's thread finishes in the background; its result is discarded
+        for task in pending:
+            task.cancel()
     
     logger.info("All methods failed")
     return None, None, "all_methods_failed"
@@ -298,17 +502,14 @@ def generate_checklist_ai(transcript: str, video_info: Dict[str, str]) -> str:
     
     # Truncate transcript if too long
     if len(transcript) > 15000:
-        logger.info(f"Transcript is {len(transcript)} characters - using first 15000 for analysis")
+        logger.info("Transcript is %d characters - using first 15000 for analysis", len(transcript))
         working_transcript = transcript[:15000] + "\n\n[Note: Transcript truncated for processing]"
     else:
         working_transcript = transcript
     
     # Analyze content type
-    has_instructions = any(keyword in transcript.lower() for keyword in [
-        'how to', 'step', 'first', 'next', 'then', 'now', 'let\'s', 'you need to',
-        'make sure', 'important', 'remember', 'tutorial', 'guide', 'process',
-        'install', 'setup', 'configure', 'build', 'create', 'add', 'remove'
-    ])
+    transcript_lower = transcript.lower()
+    has_instructions = any(keyword in transcript_lower for keyword in _INSTRUCTION_KEYWORDS)
     
     if has_instructions:
         logger.info("Detected instructional content - generating step-by-step checklist")
@@ -317,24 +518,25 @@ def generate_checklist_ai(transcript: str, video_info: Dict[str, str]) -> str:
         logger.info("Detected review/commentary content - generating key points checklist")
         checklist_type = "review"
     
-    # Split into segments
-    lines = working_transcript.split('\n')
+    # Split at sentence ends and line breaks, then merge the pieces into segments
     text_segments = []
-    current_segment = ""
+    current_parts = []
+    current_length = 0
     
-    for line in lines:
-        line = line.strip()
-        if line:
-            current_segment += line + " "
-            if (line.endswith('.') or line.endswith('!') or line.endswith('?') or 
-                len(current_segment) > 200) and len(current_segment) > 50:
-                text_segments.append(current_segment.strip())
-                current_segment = ""
+    for piece in _SEGMENT_SPLIT_RE.split(working_transcript):
+        piece = piece.strip()
+        if piece:
+            current_parts.append(piece)
+            current_length += len(piece) + 1
+            if (piece[-1] in '.!?' or current_length > 200) and current_length > 50:
+                text_segments.append(' '.join(current_parts))
+                current_parts = []
+                current_length = 0
     
-    if current_segment.strip():
-        text_segments.append(current_segment.strip())
+    if current_parts:
+        text_segments.append(' '.join(current_parts))
     
-    logger.info(f"Identified {len(text_segments)} content segments for analysis")
+    logger.info("Identified %d content segments for analysis", len(text_segments))
     
     # Generate checklist
     if checklist_type == "instructional":
@@ -348,38 +550,28 @@ def generate_checklist_ai(transcript: str, video_info: Dict[str, str]) -> str:
 def generate_instructional_checklist(segments: List[str], video_info: Dict[str, str]) -> str:
     """Generate checklist for instructional content."""
     
-    action_keywords = ['install', 'download', 'create', 'open', 'click', 'add', 'remove', 
-                      'setup', 'configure', 'build', 'run', 'execute', 'make', 'set',
-                      'copy', 'paste', 'save', 'delete', 'move', 'edit', 'change']
-    
     checklist_items = []
     
     for segment in segments:
-        segment_lower = segment.lower()
-        
-        if any(keyword in segment_lower for keyword in action_keywords):
+        if _ACTION_RE.search(segment):
             sentences = segment.split('. ')
             for sentence in sentences:
                 sentence = sentence.strip()
-                if any(keyword in sentence.lower() for keyword in action_keywords):
+                if _ACTION_RE.search(sentence):
                     if sentence and not sentence.endswith('.'):
                         sentence += '.'
                     
-                    sentence = re.sub(r'\b(um|uh|you know|like|basically|actually)\b', '', sentence, flags=re.IGNORECASE)
-                    sentence = ' '.join(sentence.split())
+                    tokens = _FILLER_RE.sub('', sentence).split()
+                    sentence = ' '.join(tokens)
                     
                     if len(sentence) > 20 and len(sentence) < 300:
-                        if not sentence.lower().startswith(('install', 'download', 'create', 'open', 'click')):
-                            sentence = "**" + sentence.split()[0].title() + "** " + ' '.join(sentence.split()[1:])
-                        else:
-                            sentence = "**" + sentence.split()[0].title() + "** " + ' '.join(sentence.split()[1:])
-                        
+                        sentence = f"**{tokens[0].title()}** " + ' '.join(tokens[1:])
                         checklist_items.append(f"- [ ] {sentence}")
     
     if len(checklist_items) < 3:
         checklist_items = extract_key_points(segments)
     
-    checklist = f"""# YouTube Video Checklist
+    checklist_parts = [f"""# YouTube Video Checklist
 
 **Source:** {video_info['url']}
 **Video ID:** {video_info['video_id']}
@@ -387,44 +579,36 @@ def generate_instructional_checklist(segments: List[str], video_info: Dict[str,
 
 ## Steps to Follow
 
-"""
+"""]
     
-    seen = set()
-    for item in checklist_items[:15]:
-        if item not in seen:
-            checklist += item + "\n"
-            seen.add(item)
+    for item in dict.fromkeys(checklist_items[:15]):
+        checklist_parts.append(item + "\n")
     
     if not checklist_items:
-        checklist += "- [ ] **Watch the video** for specific instructions\n"
-        checklist += "- [ ] **Take notes** on key points mentioned\n"
-        checklist += "- [ ] **Follow along** with the demonstration\n"
+        checklist_parts.append("- [ ] **Watch the video** for specific instructions\n")
+        checklist_parts.append("- [ ] **Take notes** on key points mentioned\n")
+        checklist_parts.append("- [ ] **Follow along** with the demonstration\n")
     
-    return checklist
+    return ''.join(checklist_parts)
 
 def generate_review_checklist(segments: List[str], video_info: Dict[str, str], full_transcript: str) -> str:
     """Generate checklist for review/commentary content."""
     
     key_points = []
-    positive_words = ['good', 'great', 'awesome', 'excellent', 'love', 'like', 'impressed', 'solid']
-    negative_words = ['bad', 'terrible', 'hate', 'disappointing', 'issues', 'problems', 'buggy']
-    feature_words = ['feature', 'system', 'mechanic', 'graphics', 'sound', 'gameplay', 'story']
     
     for segment in segments:
-        segment_lower = segment.lower()
-        
-        if any(word in segment_lower for word in positive_words + negative_words + feature_words):
+        if _REVIEW_RE.search(segment):
             sentences = segment.split('. ')
             for sentence in sentences:
                 sentence = sentence.strip()
                 if len(sentence) > 30 and len(sentence) < 200:
-                    sentence = re.sub(r'\b(um|uh|you know|like|basically|actually)\b', '', sentence, flags=re.IGNORECASE)
+                    sentence = _FILLER_RE.sub('', sentence)
                     sentence = ' '.join(sentence.split())
                     
                     if sentence:
                         key_points.append(sentence)
     
-    checklist = f"""# YouTube Video Review Checklist
+    checklist_parts = [f"""# YouTube Video Review Checklist
 
 **Source:** {video_info['url']}
 **Video ID:** {video_info['video_id']}
@@ -432,45 +616,44 @@ def generate_review_checklist(segments: List[str], video_info: Dict[str, str], f
 
 ## Key Points to Consider
 
-"""
+"""]
     
     seen_topics = set()
     for point in key_points[:12]:
         words = point.lower().split()
         topic_word = None
         for word in words:
-            if word in ['game', 'graphics', 'sound', 'story', 'gameplay', 'combat', 'building', 'features']:
+            if word in _REVIEW_TOPIC_WORDS:
                 topic_word = word
                 break
         
         if topic_word and topic_word not in seen_topics:
-            checklist += f"- [ ] **Evaluate {topic_word}** - {point}\n"
+            checklist_parts.append(f"- [ ] **Evaluate {topic_word}** - {point}\n")
             seen_topics.add(topic_word)
         elif not topic_word:
-            checklist += f"- [ ] **Consider** - {point}\n"
+            checklist_parts.append(f"- [ ] **Consider** - {point}\n")
     
     if len(key_points) < 5:
-        checklist += "- [ ] **Note the reviewer's overall opinion** of the subject\n"
-        checklist += "- [ ] **Identify key strengths** mentioned in the review\n"
-        checklist += "- [ ] **Identify key weaknesses** mentioned in the review\n"
-        checklist += "- [ ] **Consider the reviewer's background** and expertise\n"
-        checklist += "- [ ] **Evaluate relevance** to your own interests or needs\n"
+        checklist_parts.append("- [ ] **Note the reviewer's overall opinion** of the subject\n")
+        checklist_parts.append("- [ ] **Identify key strengths** mentioned in the review\n")
+        checklist_parts.append("- [ ] **Identify key weaknesses** mentioned in the review\n")
+        checklist_parts.append("- [ ] **Consider the reviewer's background** and expertise\n")
+        checklist_parts.append("- [ ] **Evaluate relevance** to your own interests or needs\n")
     
-    return checklist
+    return ''.join(checklist_parts)
 
 def extract_key_points(segments: List[str]) -> List[str]:
     """Extract key points when specific instructions aren't found."""
     
     points = []
-    important_indicators = ['important', 'key', 'main', 'essential', 'critical', 'remember', 'note']
     
     for segment in segments:
         segment_lower = segment.lower()
         
-        if (any(indicator in segment_lower for indicator in important_indicators) or
+        if (_IMPORTANT_RE.search(segment_lower) or
             segment.endswith('!') or 'you should' in segment_lower or 'make sure' in segment_lower):
             
-            clean_segment = re.sub(r'\b(um|uh|you know|like|basically|actually)\b', '', segment, flags=re.IGNORECASE)
+            clean_segment = _FILLER_RE.sub('', segment)
             clean_segment = ' '.join(clean_segment.split())
             
             if len(clean_segment) > 20 and len(clean_segment) < 250:
@@ -478,12 +661,34 @@ def extract_key_points(segments: List[str]) -> List[str]:
     
     return points
 
+def _write_text(fd: int, text: str) -> None:
+    """Encode text as UTF-8 with platform line endings and write all of it to fd."""
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    data = memoryview(text.encode('utf-8'))
+    while data:
+        data = data[os.write(fd, data):]
+
+def write_transcript_file(path: str, header: str, transcript: str) -> None:
+    """Write a transcript file with raw os.write calls, encoding the text one slice at a time."""
+    # Writing the whole string at once would encode it into a second full-size bytes copy;
+    # transcripts up to one slice long go out with the header in a single write
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        _write_text(fd, header + transcript[:TRANSCRIPT_WRITE_CHUNK])
+        for start in range(TRANSCRIPT_WRITE_CHUNK, len(transcript), TRANSCRIPT_WRITE_CHUNK):
+            _write_text(fd, transcript[start:start + TRANSCRIPT_WRITE_CHUNK])
+    finally:
+        os.close(fd)
+
 def save_results(video_info: Dict[str, str], transcript: str, transcript_data: List[Dict], 
                 checklist: str, method_used: str) -> Dict[str, str]:
     """Save all results with method information."""
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_video_id = re.sub(r'[^\w\-_]', '_', video_info['video_id'])
+    # One clock read per save keeps the file name and header timestamps in step
+    now = time.localtime()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
+    safe_video_id = _SAFE_ID_RE.sub('_', video_info['video_id'])
     
     base_path = "C:\\Users\\ruben\\Claude Tools\\projects\\ai-tools\\youtube-checklister\\outputs"
     
@@ -497,34 +702,36 @@ def save_results(video_info: Dict[str, str], transcript: str, transcript_data: L
     # Save transcript
     transcript_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_transcript.txt")
     try:
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write(f"YouTube Video Transcript\n")
-            f.write(f"========================\n\n")
-            f.write(f"Video ID: {video_info['video_id']}\n")
-            f.write(f"Title: {video_info.get('title', 'Unknown')}\n")
-            f.write(f"URL: {video_info['url']}\n")
-            f.write(f"Extraction Method: {method_used}\n")
-            f.write(f"Extracted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("TRANSCRIPT:\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(transcript)
+        header = _HEADER_TMPL.format(
+            vid=video_info['video_id'],
+            title_line=f"Title: {video_info.get('title', 'Unknown')}\n",
+            url=video_info['url'],
+            method=method_used,
+            ts=time.strftime('%Y-%m-%d %H:%M:%S', now),
+        )
+        write_transcript_file(transcript_file, header, transcript)
         files_created['transcript'] = transcript_file
     except Exception as e:
-        logger.warning(f"Could not save transcript: {e}")
+        logger.warning("Could not save transcript: %s", e)
     
     # Save JSON data
     json_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_raw_data.json")
     try:
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'video_info': video_info,
-                'transcript_data': transcript_data,
-                'extraction_method': method_used,
-                'processed_at': datetime.now().isoformat()
-            }, f, indent=2, ensure_ascii=False)
+        payload = {
+            'video_info': video_info,
+            'transcript_data': transcript_data,
+            'extraction_method': method_used,
+            'processed_at': datetime.now().isoformat()
+        }
+        if orjson is not None:
+            with open(json_file, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
         files_created['json'] = json_file
     except Exception as e:
-        logger.warning(f"Could not save JSON data: {e}")
+        logger.warning("Could not save JSON data: %s", e)
     
     # Save checklist
     checklist_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_CHECKLIST.md")
@@ -535,26 +742,72 @@ def save_results(video_info: Dict[str, str], transcript: str, transcript_data: L
         with open(checklist_file, 'w', encoding='utf-8') as f:
             f.write(enhanced_checklist)
         files_created['checklist'] = checklist_file
-        logger.info(f"AUTO-GENERATED CHECKLIST saved: {checklist_file}")
+        logger.info("AUTO-GENERATED CHECKLIST saved: %s", checklist_file)
     except Exception as e:
-        logger.warning(f"Could not save checklist: {e}")
+        logger.warning("Could not save checklist: %s", e)
     
     return files_created
 
+def save_transcript(video_info: Dict[str, str], transcript: str, method_used: str) -> Optional[str]:
+    """Save only the transcript; returns the file path, or None if it could not be written."""
+    
+    # One clock read per save keeps the file name and header timestamps in step
+    now = time.localtime()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
+    safe_video_id = _SAFE_ID_RE.sub('_', video_info['video_id'])
+    base_path = "C:\\Users\\ruben\\Claude Tools\\projects\\ai-tools\\youtube-checklister\\outputs"
+    
+    try:
+        os.makedirs(base_path, exist_ok=True)
+        transcript_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_transcript.txt")
+        
+        header = _HEADER_TMPL.format(
+            vid=video_info['video_id'],
+            title_line="",
+            url=video_info['url'],
+            method=method_used,
+            ts=time.strftime('%Y-%m-%d %H:%M:%S', now),
+        )
+        write_transcript_file(transcript_file, header, transcript)
+        
+        return transcript_file
+    except Exception as e:
+        logger.warning("Could not save transcript file: %s", e)
+        return None
+
+def _text_size(result: Any) -> int:
+    """Total length of the text items in a tool result (0 for other results)."""
+    content = result.get("content") if isinstance(result, dict) else None
+    if not isinstance(content, list):
+        return 0
+    return sum(len(item.get("text", "")) for item in content if isinstance(item, dict))
+
 # MCP Server Implementation
 class YouTubeMCPServer:
-    def __init__(self):
+    def __init__(self, stdout: Optional[io.BufferedIOBase] = None):
         self.server_info = {
             "name": "youtube-mcp",
             "version": "1.0.0"
         }
+        self.method_handlers = {
+            "initialize": self.handle_initialize,
+            "tools/list": self.handle_list_tools,
+            "tools/call": self.handle_call_tool,
+        }
+        self.stdout = stdout if stdout is not None else sys.stdout.buffer
+        self._outbuf = bytearray(STDOUT_BUFFER_SIZE)
+        self._outlen = 0
+        self._flush_scheduled = False
     
     async def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP initialize request"""
         logger.info("Initializing YouTube MCP Server")
         
-        # Install dependencies on initialization
-        install_dependencies()
+        # Install dependencies on initialization (once per process, only if missing)
+        global _DEPS_OK
+        if not _DEPS_OK:
+            install_dependencies()
+            _DEPS_OK = True
         
         return {
             "protocolVersion": "2024-11-05",
@@ -577,13 +830,23 @@ class YouTubeMCPServer:
                             "type": "string",
                             "description": "YouTube URL or video ID"
                         },
+                        "urls": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several YouTube URLs or video IDs to process concurrently (used instead of url)"
+                        },
                         "save_files": {
                             "type": "boolean",
                             "description": "Whether to save transcript and checklist files (default: true)",
                             "default": True
+                        },
+                        "force_refresh": {
+                            "type": "boolean",
+                            "description": "Ignore the cached transcript and extract it again (default: false)",
+                            "default": False
                         }
                     },
-                    "required": ["url"]
+                    "required": []
                 }
             },
             {
@@ -596,13 +859,23 @@ class YouTubeMCPServer:
                             "type": "string",
                             "description": "YouTube URL or video ID"
                         },
+                        "urls": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several YouTube URLs or video IDs to process concurrently (used instead of url)"
+                        },
                         "save_file": {
                             "type": "boolean",
                             "description": "Whether to save transcript file (default: false)",
                             "default": False
+                        },
+                        "force_refresh": {
+                            "type": "boolean",
+                            "description": "Ignore the cached transcript and extract it again (default: false)",
+                            "default": False
                         }
                     },
-                    "required": ["url"]
+                    "required": []
                 }
             },
             {
@@ -614,6 +887,11 @@ class YouTubeMCPServer:
                         "url": {
                             "type": "string",
                             "description": "YouTube URL or video ID"
+                        },
+                        "force_refresh": {
+                            "type": "boolean",
+                            "description": "Re-test the extraction methods even if this session already has the transcript (default: false)",
+                            "default": False
                         }
                     },
                     "required": ["url"]
@@ -630,8 +908,12 @@ class YouTubeMCPServer:
         
         try:
             if tool_name == "youtube_to_checklist":
+                if arguments.get("urls"):
+                    return await self.run_batch(self.youtube_to_checklist, arguments)
                 return await self.youtube_to_checklist(arguments)
             elif tool_name == "youtube_transcript":
+                if arguments.get("urls"):
+                    return await self.run_batch(self.youtube_transcript, arguments)
                 return await self.youtube_transcript(arguments)
             elif tool_name == "youtube_debug":
                 return await self.youtube_debug(arguments)
@@ -646,7 +928,7 @@ class YouTubeMCPServer:
                     "isError": True
                 }
         except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {str(e)}")
+            logger.error("Error executing tool %s: %s", tool_name, e)
             return {
                 "content": [
                     {
@@ -657,12 +939,49 @@ class YouTubeMCPServer:
                 "isError": True
             }
     
+    async def run_batch(self, handler, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single-URL tool handler for every entry in arguments['urls'] concurrently"""
+        urls = arguments["urls"]
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        logger.info("Processing batch of %d videos", len(urls))
+        
+        async def run_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await handler({**arguments, "url": url})
+        
+        results = await asyncio.gather(*(run_one(url) for url in urls), return_exceptions=True)
+        
+        sections = []
+        failures = 0
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                failures += 1
+                sections.append(f"ERROR: Could not process {url}: {str(result)}")
+            else:
+                if result.get("isError"):
+                    failures += 1
+                sections.append("\n".join(item["text"] for item in result["content"]))
+        
+        response = {
+            "content": [
+                {
+                    "type": "text",
+                    "text": f"Batch Results: {len(urls) - failures} of {len(urls)} videos succeeded\n\n" +
+                            "\n\n==========\n\n".join(sections)
+                }
+            ]
+        }
+        if failures == len(urls):
+            response["isError"] = True
+        return response
+    
     async def youtube_to_checklist(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Convert YouTube video to checklist"""
         url = arguments.get("url")
         save_files = arguments.get("save_files", True)
         
-        logger.info(f"Converting YouTube video to checklist: {url}")
+        logger.info("Converting YouTube video to checklist: %s", url)
         
         # Extract video ID
         video_id = extract_video_id(url)
@@ -681,7 +1000,9 @@ class YouTubeMCPServer:
         video_info = get_video_info(video_id)
         
         # Extract transcript with robust method
-        transcript_text, transcript_data, method_used = get_transcript_robust(video_id)
+        transcript_text, transcript_data, method_used = await get_transcript_robust(
+            video_id, force_refresh=arguments.get("force_refresh", False)
+        )
         
         if not transcript_text:
             return {
@@ -710,10 +1031,13 @@ Try: A different video or check if the video has captions enabled."""
         # Save files if requested
         files_created = {}
         if save_files:
-            files_created = save_results(video_info, transcript_text, transcript_data, checklist, method_used)
+            # Write the three output files off the event loop so other tool calls keep running
+            files_created = await asyncio.to_thread(
+                save_results, video_info, transcript_text, transcript_data, checklist, method_used
+            )
         
         # Prepare response
-        response_text = f"""SUCCESS: YouTube Video Successfully Converted to Checklist
+        response_parts = [f"""SUCCESS: YouTube Video Successfully Converted to Checklist
 
 Video ID: {video_id}
 URL: {video_info['url']}
@@ -726,20 +1050,20 @@ Transcript Length: {len(transcript_text)} characters
 
 ---
 
-"""
+"""]
         
         if save_files and files_created:
-            response_text += "Files Created:\n"
+            response_parts.append("Files Created:\n")
             for file_type, file_path in files_created.items():
-                response_text += f"- {file_type.title()}: {file_path}\n"
+                response_parts.append(f"- {file_type.title()}: {file_path}\n")
         else:
-            response_text += "Files not saved (save_files=false)"
+            response_parts.append("Files not saved (save_files=false)")
         
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": response_text
+                    "text": ''.join(response_parts)
                 }
             ]
         }
@@ -749,7 +1073,7 @@ Transcript Length: {len(transcript_text)} characters
         url = arguments.get("url")
         save_file = arguments.get("save_file", False)
         
-        logger.info(f"Extracting transcript from YouTube video: {url}")
+        logger.info("Extracting transcript from YouTube video: %s", url)
         
         # Extract video ID
         video_id = extract_video_id(url)
@@ -768,7 +1092,9 @@ Transcript Length: {len(transcript_text)} characters
         video_info = get_video_info(video_id)
         
         # Extract transcript with robust method
-        transcript_text, transcript_data, method_used = get_transcript_robust(video_id)
+        transcript_text, transcript_data, method_used = await get_transcript_robust(
+            video_id, force_refresh=arguments.get("force_refresh", False)
+        )
         
         if not transcript_text:
             return {
@@ -792,42 +1118,28 @@ Possible reasons:
         # Save file if requested
         file_created = None
         if save_file:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_video_id = re.sub(r'[^\w\-_]', '_', video_info['video_id'])
-            base_path = "C:\\Users\\ruben\\Claude Tools\\projects\\ai-tools\\youtube-checklister\\outputs"
-            
-            try:
-                os.makedirs(base_path, exist_ok=True)
-                transcript_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_transcript.txt")
-                
-                with open(transcript_file, 'w', encoding='utf-8') as f:
-                    f.write(f"YouTube Video Transcript\n")
-                    f.write(f"========================\n\n")
-                    f.write(f"Video ID: {video_info['video_id']}\n")
-                    f.write(f"URL: {video_info['url']}\n")
-                    f.write(f"Extraction Method: {method_used}\n")
-                    f.write(f"Extracted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                    f.write("TRANSCRIPT:\n")
-                    f.write("=" * 50 + "\n\n")
-                    f.write(transcript_text)
-                
-                file_created = transcript_file
-            except Exception as e:
-                logger.warning(f"Could not save transcript file: {e}")
+            # Write off the event loop so other tool calls keep running
+            file_created = await asyncio.to_thread(save_transcript, video_info, transcript_text, method_used)
         
         # Prepare response
+        transcript_length = len(transcript_text)
+        if transcript_length > 2000:
+            preview = transcript_text[:2000] + "..."
+        else:
+            preview = transcript_text
+        
         response_text = f"""SUCCESS: Transcript Successfully Extracted
 
 Video ID: {video_id}
 URL: {video_info['url']}
 Extraction Method: {method_used}
-Length: {len(transcript_text)} characters
+Length: {transcript_length} characters
 
 ---
 
 TRANSCRIPT:
 
-{transcript_text[:2000]}{"..." if len(transcript_text) > 2000 else ""}
+{preview}
 
 ---
 
@@ -851,7 +1163,7 @@ TRANSCRIPT:
         """Debug YouTube transcript extraction"""
         url = arguments.get("url")
         
-        logger.info(f"Debugging YouTube transcript extraction: {url}")
+        logger.info("Debugging YouTube transcript extraction: %s", url)
         
         # Extract video ID
         video_id = extract_video_id(url)
@@ -866,92 +1178,118 @@ TRANSCRIPT:
                 "isError": True
             }
         
-        debug_info = []
-        debug_info.append(f"YouTube Transcript Debug Information\n")
-        debug_info.append(f"Video ID: {video_id}")
-        debug_info.append(f"URL: https://www.youtube.com/watch?v={video_id}\n")
-        
-        # Test primary method
-        debug_info.append("Testing Primary Method (youtube-transcript-api):")
-        transcript_text, transcript_data, method = get_transcript_primary_method(video_id)
-        
-        if transcript_text:
-            debug_info.append(f"SUCCESS - Extracted {len(transcript_text)} characters")
-            debug_info.append(f"Method: {method}")
+        debug_info = io.StringIO()
+        debug_info.write(
+            f"YouTube Transcript Debug Information\n\n"
+            f"Video ID: {video_id}\n"
+            f"URL: https://www.youtube.com/watch?v={video_id}\n\n"
+        )
+        
+        # Reuse a transcript this session already extracted unless a fresh test is requested
+        cached = None if arguments.get("force_refresh") else _transcript_cache.get(video_id)
+        
+        if cached is not None:
+            _transcript_cache.move_to_end(video_id)
+            transcript_text, transcript_data, method = cached
+            debug_info.write(
+                f"Using Cached Transcript (extracted earlier this session):\n"
+                f"SUCCESS - {len(transcript_text)} characters\n"
+                f"Method: {method}\n"
+                f"Pass force_refresh=true to re-test the extraction methods\n"
+            )
         else:
-            debug_info.append(f"FAILED - {method}")
-        
-        debug_info.append("")
-        
-        # Test fallback method if primary failed
-        if not transcript_text:
-            debug_info.append("Testing Fallback Method (yt-dlp):")
-            transcript_text, transcript_data, method = get_transcript_fallback_method(video_id)
+            # Test primary method
+            debug_info.write("Testing Primary Method (youtube-transcript-api):\n")
+            transcript_text, transcript_data, method = await asyncio.to_thread(get_transcript_primary_method, video_id)
             
             if transcript_text:
-                debug_info.append(f"SUCCESS - Extracted {len(transcript_text)} characters")
-                debug_info.append(f"Method: {method}")
+                debug_info.write(f"SUCCESS - Extracted {len(transcript_text)} characters\nMethod: {method}\n")
             else:
-                debug_info.append(f"FAILED - {method}")
+                debug_info.write(f"FAILED - {method}\n")
+            
+            debug_info.write("\n")
+            
+            # Test fallback method if primary failed
+            if not transcript_text:
+                debug_info.write("Testing Fallback Method (yt-dlp):\n")
+                transcript_text, transcript_data, method = await asyncio.to_thread(get_transcript_fallback_method, video_id)
+                
+                if transcript_text:
+                    debug_info.write(f"SUCCESS - Extracted {len(transcript_text)} characters\nMethod: {method}\n")
+                else:
+                    debug_info.write(f"FAILED - {method}\n")
+            
+            # Later extraction calls for this video reuse what the test fetched
+            if transcript_text:
+                await remember_transcript(video_id, (transcript_text, transcript_data, method))
         
-        debug_info.append("")
+        debug_info.write("\n")
         
         # Final status
         if transcript_text:
-            debug_info.append("Overall Result: SUCCESS")
-            debug_info.append(f"Final Method: {method}")
-            debug_info.append(f"Transcript Preview: {transcript_text[:500]}...")
+            debug_info.write(
+                f"Overall Result: SUCCESS\n"
+                f"Final Method: {method}\n"
+                f"Transcript Preview: {transcript_text[:500]}..."
+            )
         else:
-            debug_info.append("Overall Result: FAILED")
-            debug_info.append("Recommendation: Try a different video or verify the video has captions")
+            debug_info.write(
+                "Overall Result: FAILED\n"
+                "Recommendation: Try a different video or verify the video has captions"
+            )
         
         return {
             "content": [
                 {
                     "type": "text",
-                    "text": "\n".join(debug_info)
+                    "text": debug_info.getvalue()
                 }
             ]
         }
 
-async def main():
-    """Main MCP server loop"""
-    server = YouTubeMCPServer()
+    def send_message(self, message: Dict[str, Any]) -> None:
+        """Queue a JSON-RPC message on stdout"""
+        self.send_frame(_dumps_line(message))
     
-    logger.info("Starting YouTube MCP Server...")
+    def send_frame(self, data: bytes) -> None:
+        """Queue an encoded message; one flush per event loop pass covers every message written in it"""
+        end = self._outlen + len(data)
+        # Overwrites the previous batch in place; grows the buffer only when it is full
+        self._outbuf[self._outlen:end] = data
+        self._outlen = end
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush_output)
     
-    while True:
+    def flush_output(self) -> None:
+        """Write every buffered message to stdout in one go"""
+        self._flush_scheduled = False
+        with memoryview(self._outbuf) as view, view[:self._outlen] as pending:
+            write_all(self.stdout, pending)
+        
+        self._outlen = 0
+        if len(self._outbuf) > STDOUT_BUFFER_MAX:
+            self._outbuf = bytearray(STDOUT_BUFFER_SIZE)
+    
+    async def handle_message(self, line: bytes) -> None:
+        """Parse one request line, dispatch it and send the response"""
         try:
-            # Use async stdin reading for compatibility with Claude Desktop
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
-            
-            if not line:
-                break
-            
-            line = line.strip()
-            if not line:
-                continue
-            
             try:
-                request = json.loads(line)
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON received: {e}")
-                continue
+                request = _loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.error("Invalid JSON received: %s", e)
+                return
             
             method = request.get("method")
             params = request.get("params", {})
             request_id = request.get("id")
             
             # Handle different MCP methods
-            if method == "initialize":
-                result = await server.handle_initialize(params)
-            elif method == "tools/list":
-                result = await server.handle_list_tools(params)
-            elif method == "tools/call":
-                result = await server.handle_call_tool(params)
-            else:
-                logger.warning(f"Unknown method: {method}")
-                continue
+            handler = self.method_handlers.get(method)
+            if handler is None:
+                logger.warning("Unknown method: %s", method)
+                return
+            result = await handler(params)
             
             # Send response
             response = {
@@ -959,24 +1297,62 @@ async def main():
                 "id": request_id,
                 "result": result
             }
-            
-            print(json.dumps(response))
-            sys.stdout.flush()
+            if _text_size(result) > LARGE_RESPONSE_CHARS:
+                # Encode big tool results in a worker thread so other requests keep being served
+                self.send_frame(await asyncio.to_thread(_dumps_line, response))
+            else:
+                self.send_message(response)
             
         except Exception as e:
-            logger.error(f"Error in main loop: {e}")
+            logger.error("Error handling request: %s", e)
             if 'request_id' in locals():
-                error_response = {
+                self.send_message({
                     "jsonrpc": "2.0",
                     "id": request_id,
                     "error": {
                         "code": -32603,
                         "message": f"Internal error: {str(e)}"
                     }
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+                })
+
+async def main():
+    """Main MCP server loop"""
+    # The server batches responses itself, so write them to the unbuffered stdout file
+    stdout = io.FileIO(sys.stdout.fileno(), 'w', closefd=False)
+    server = YouTubeMCPServer(stdout)
+    
+    logger.info("Starting YouTube MCP Server...")
+    
+    read_line = await stdin_line_reader(STDIN_LINE_LIMIT)
+    
+    # The reader only queues lines; workers handle them concurrently and
+    # responses go out as each one completes
+    queue: "asyncio.Queue[bytes]" = asyncio.Queue()
+    workers = [asyncio.create_task(request_worker(server, queue)) for _ in range(REQUEST_WORKERS)]
+    
+    while True:
+        try:
+            line = await read_line()
+        except ValueError as e:
+            # Line longer than STDIN_LINE_LIMIT; the reader has already discarded it
+            logger.error("Error reading stdin: %s", e)
+            continue
+        
+        if not line:
+            break
+        
+        line = line.strip()
+        if line:
+            queue.put_nowait(line)
+    
+    # Finish requests already received before exiting on EOF
+    await queue.join()
+    for worker in workers:
+        worker.cancel()
+    server.flush_output()
+    
+    if _HTTP_SESSION is not None:
+        _HTTP_SESSION.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
-
@@ -25,23 +25,62 @@ Protocol: JSON-RPC 2.0 compatible (2024-11-05)
 """
 
 import asyncio
+import functools
+import hashlib
+import io
 import json
 import logging
 import os
 import re
 import subprocess
 import sys
+import tempfile
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
-from collections import Counter
-import statistics
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union, Any
+from collections import Counter, defaultdict
+
+from mcp_stdio import request_worker, stdin_line_reader, write_all
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize one newline-terminated JSON-RPC frame."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj).encode('utf-8') + b"\n"
+
+# Extraction backends, imported once; install_dependencies may still add them later
+try:
+    from youtube_transcript_api import YouTubeTranscriptApi
+    from youtube_transcript_api.formatters import TextFormatter
+    _FORMATTER = TextFormatter()
+except ImportError:
+    YouTubeTranscriptApi = None
+    _FORMATTER = None
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
 
 # Setup logging
 log_file = r"C:\Users\ruben\Claude Tools\logs\youtube_mcp_enhanced.log"
 os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
+# Per-step extraction and analysis messages are DEBUG; set YOUTUBE_MCP_DEBUG to log them
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.DEBUG if os.environ.get('YOUTUBE_MCP_DEBUG') else logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(log_file, encoding='utf-8')
@@ -49,6 +88,113 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum number of videos fetched at once by get_transcripts_batch
+BATCH_CONCURRENCY = 8
+
+# Longest JSON-RPC request line accepted on stdin
+STDIN_LINE_LIMIT = 16 * 1024 * 1024
+
+# Requests handled concurrently by the main loop
+REQUEST_WORKERS = 8
+
+# Insights kept per transcript; the extractors stop scanning once they have this many
+MAX_INSIGHTS = 12
+
+# Characters of a transcript fed to the content analyzer
+ANALYSIS_CHAR_LIMIT = 20000
+
+# On-disk cache: one JSON file per transcript (same layout as youtube_mcp.py, so the
+# two servers share fetches) plus content analyses keyed by a hash of the transcript
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'youtube-mcp')
+ANALYSIS_CACHE_DIR = os.path.join(CACHE_DIR, 'analysis')
+CACHE_TTL = 7 * 24 * 60 * 60
+
+# Where save_enhanced_results writes; created on the first save (see _ensure_output_dir)
+OUTPUT_DIR = "C:\\Users\\ruben\\Claude Tools\\projects\\ai-tools\\youtube-checklister\\outputs"
+_output_dir: Optional[str] = None
+
+# Precompiled patterns shared by the extraction, analysis and checklist helpers
+# Any supported URL form (group 1) or a bare 11-character video ID (group 2)
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+    r'|^([a-zA-Z0-9_-]{11})$'
+)
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+# Sentence endings; a dot right after a common abbreviation does not end a sentence
+# (one fixed-width lookbehind per abbreviation, as Python requires)
+_SENTENCE_END_RE = re.compile(
+    r'[.!?](?<!\bMr\.)(?<!\bMrs\.)(?<!\bDr\.)(?<!\bProf\.)(?<!\bSr\.)(?<!\bJr\.)[.!?]*'
+)
+_FILLER_RE = re.compile(r'\b(?:um|uh|you know|like|basically|actually|literally)\b', re.IGNORECASE)
+_SAFE_ID_RE = re.compile(r'[^\w\-_]')
+# ASCII translation table for the same substitution: code point i maps to itself when
+# it is [A-Za-z0-9_-] and to '_' otherwise
+_SAFE_ID_TABLE = ''.join(
+    c if c.isalnum() or c in '-_' else '_' for c in map(chr, range(128))
+)
+
+# Sentence classifiers used by ContentAnalyzer; each category's word lists are fused
+# into one alternation so a sentence is classified with a single search. Sentences
+# are searched one at a time rather than scanning the whole transcript per category,
+# since the elif chains in the extractors stop at the first category that matches.
+_INSTRUCTIONAL_RE = re.compile(r'\b(first|next|then|now|finally|step \d+|you need to|make sure|important|remember|click|press|select|choose|go to)\b')
+_STEP_RE = re.compile(r'\b(first|next|then|now|finally|step \d+|install|download|create|setup|configure|click|press|select|choose|go to)\b')
+_IMPORTANT_RE = re.compile(r'\b(important|crucial|essential|make sure|remember|warning|caution|careful|avoid)\b')
+_POSITIVE_RE = re.compile(r'\b(good|great|excellent|amazing|love|like|impressed|solid|recommend|pros?|advantages?|benefits?|strengths?)\b')
+_NEGATIVE_RE = re.compile(r'\b(bad|terrible|awful|hate|disappointing|issues?|problems?|buggy|cons?|disadvantages?|weaknesses?|flaws?)\b')
+_FEATURE_RE = re.compile(r'\b(feature|functionality|system|performance|quality|design)\b')
+_STRATEGY_RE = re.compile(r'\b(strategy|tactic|tip|trick|build|combo|meta|best|optimal|effective|powerful|strong)\b')
+_GAMEPLAY_RE = re.compile(r'\b(gameplay|mechanics|system|combat|level|quest)\b')
+_OPINION_RE = re.compile(r'\b(think|believe|opinion|perspective|view|feel|argue|claim|suggest|propose|theorize)\b')
+_FACT_RE = re.compile(r'\b(research|study|data|statistics|evidence|proof|according to|studies show|research indicates)\b')
+_CONCEPT_RE = re.compile(r'\b(concept|principle|theory|law|rule|definition|explain|understand|means|defined as|refers to)\b')
+_EXAMPLE_RE = re.compile(r'\b(example|instance|case|illustration|demonstration|for example|such as|like|including)\b')
+_KEY_RE = re.compile(r'\b(important|key|main|primary|essential|crucial|remember|note|realize|understand|consider|interesting|surprising|remarkable|notable)\b')
+
+# Static closing sections of the type-specific checklists, appended as one string
+_TUTORIAL_GUIDELINES = (
+    "### General Tutorial Guidelines\n"
+    "- [ ] **Prepare:** Gather all necessary tools and materials\n"
+    "- [ ] **Follow along:** Watch the video step by step\n"
+    "- [ ] **Practice:** Try each step yourself\n"
+    "- [ ] **Verify:** Check your results match the tutorial\n"
+)
+_REVIEW_DECISION_FRAMEWORK = (
+    "### Decision Framework\n"
+    "- [ ] **Weigh pros vs cons** based on reviewer's analysis\n"
+    "- [ ] **Consider your specific needs** and use case\n"
+    "- [ ] **Research additional reviews** for comparison\n"
+    "- [ ] **Make informed decision** based on all factors\n"
+)
+_GAMING_ACTIONS = (
+    "### Gaming Action Items\n"
+    "- [ ] **Practice the techniques** mentioned in the video\n"
+    "- [ ] **Apply strategies** in your own gameplay\n"
+    "- [ ] **Test different approaches** to find what works for you\n"
+    "- [ ] **Track your progress** and improvement\n"
+)
+_DISCUSSION_ACTIONS = (
+    "### Critical Thinking Actions\n"
+    "- [ ] **Evaluate the arguments** presented in the discussion\n"
+    "- [ ] **Research supporting evidence** for key claims\n"
+    "- [ ] **Consider alternative viewpoints** not discussed\n"
+    "- [ ] **Form your own informed opinion** on the topic\n"
+)
+_LEARNING_ACTIONS = (
+    "### Learning Actions\n"
+    "- [ ] **Review key concepts** until clearly understood\n"
+    "- [ ] **Practice with examples** provided in the video\n"
+    "- [ ] **Find additional resources** on the topic\n"
+    "- [ ] **Test your understanding** with practice problems\n"
+)
+_FOLLOW_UP_ACTIONS = (
+    "### Follow-up Actions\n"
+    "- [ ] **Reflect on the main message** of the video\n"
+    "- [ ] **Identify actionable insights** relevant to you\n"
+    "- [ ] **Research additional information** on topics of interest\n"
+    "- [ ] **Apply relevant concepts** to your own situation\n"
+)
+
 def install_dependencies():
     """Install required dependencies including yt-dlp fallback."""
     required_packages = ['youtube-transcript-api', 'yt-dlp']
@@ -60,42 +206,34 @@ def install_dependencies():
             elif package == 'yt-dlp':
                 __import__('yt_dlp')
         except ImportError:
-            logger.info(f"Installing {package}...")
+            logger.info("Installing %s...", package)
             try:
                 subprocess.check_call([sys.executable, '-m', 'pip', 'install', package], 
                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                logger.info(f"{package} installed successfully!")
+                logger.info("%s installed successfully!", package)
             except Exception as e:
-                logger.warning(f"Could not install {package}: {e}")
+                logger.warning("Could not install %s: %s", package, e)
 
+@functools.lru_cache(maxsize=4096)
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from various URL formats."""
-    url = url.strip()
-    
-    patterns = [
-        r'(?:https?://)?(?:www\.)?youtube\.com/watch\?v=([a-zA-Z0-9_-]{11})',
-        r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]{11})',
-        r'(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-        r'(?:https?://)?(?:www\.)?youtube\.com/v/([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
-        return url
+    match = _VIDEO_ID_RE.search(url.strip())
+    if match:
+        return match.group(1) or match.group(2)
     
     return None
 
 def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
     """Primary method: Use youtube-transcript-api (faster when it works)."""
+    global YouTubeTranscriptApi, _FORMATTER
     try:
-        from youtube_transcript_api import YouTubeTranscriptApi
-        from youtube_transcript_api.formatters import TextFormatter
+        if _FORMATTER is None:
+            # Not importable at startup; install_dependencies may have added it since
+            from youtube_transcript_api import YouTubeTranscriptApi
+            from youtube_transcript_api.formatters import TextFormatter
+            _FORMATTER = TextFormatter()
         
-        logger.info("Trying youtube-transcript-api...")
+        logger.debug("Trying youtube-transcript-api...")
         
         transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
         transcript = None
@@ -103,7 +241,7 @@ def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optiona
         # Try manually created English first
         try:
             transcript = transcript_list.find_transcript(['en'])
-            logger.info("Found manually created English transcript")
+            logger.debug("Found manually created English transcript")
         except:
             pass
         
@@ -111,7 +249,7 @@ def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optiona
         if transcript is None:
             try:
                 transcript = transcript_list.find_generated_transcript(['en'])
-                logger.info("Found auto-generated English transcript")
+                logger.debug("Found auto-generated English transcript")
             except:
                 pass
         
@@ -119,7 +257,7 @@ def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optiona
         if transcript is None:
             for available_transcript in transcript_list:
                 transcript = available_transcript
-                logger.info(f"Using {available_transcript.language} transcript")
+                logger.debug("Using %s transcript", available_transcript.language)
                 break
         
         if transcript is None:
@@ -127,27 +265,27 @@ def get_transcript_primary_method(video_id: str) -> Tuple[Optional[str], Optiona
             return None, None, "primary_failed_no_transcripts"
         
         transcript_data = transcript.fetch()
-        formatter = TextFormatter()
-        transcript_text = formatter.format_transcript(transcript_data)
+        transcript_text = _FORMATTER.format_transcript(transcript_data)
         
-        logger.info(f"SUCCESS! Extracted {len(transcript_text)} characters")
+        logger.info("SUCCESS! Extracted %s characters", len(transcript_text))
         return transcript_text, transcript_data, "youtube-transcript-api"
         
     except Exception as e:
-        error_str = str(e)
-        logger.info(f"Primary method failed: {error_str}")
+        logger.info("Primary method failed: %s", e)
         return None, None, f"primary_failed_{type(e).__name__}"
 
 def get_transcript_fallback_method(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
     """Fallback method: Use yt-dlp (more robust, handles YouTube changes)."""
+    global yt_dlp
     try:
-        logger.info("Trying yt-dlp method...")
+        logger.debug("Trying yt-dlp method...")
         
-        try:
-            import yt_dlp
-        except ImportError:
-            logger.info("yt-dlp not available")
-            return None, None, "fallback_failed_no_ytdlp"
+        if yt_dlp is None:
+            try:
+                import yt_dlp
+            except ImportError:
+                logger.info("yt-dlp not available")
+                return None, None, "fallback_failed_no_ytdlp"
         
         ydl_opts = {
             'writesubtitles': True,
@@ -161,44 +299,33 @@ def get_transcript_fallback_method(video_id: str) -> Tuple[Optional[str], Option
             'extractor_args': {'youtube': {'player_client': ['android']}},
         }
         
-        temp_dir = os.path.join(os.getcwd(), 'temp_subs')
-        os.makedirs(temp_dir, exist_ok=True)
-        ydl_opts['outtmpl'] = os.path.join(temp_dir, f'{video_id}.%(ext)s')
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # A private temporary directory keeps concurrent fetches apart and is
+        # removed on every exit path
+        with tempfile.TemporaryDirectory(prefix='yt_subs_') as temp_dir:
+            ydl_opts['outtmpl'] = os.path.join(temp_dir, f'{video_id}.%(ext)s')
+            
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                try:
+                    logger.debug("Downloading subtitles with yt-dlp...")
+                    ydl.download([f'https://www.youtube.com/watch?v={video_id}'])
+                except Exception as e:
+                    logger.info("yt-dlp download failed: %s", e)
+                    return None, None, f"fallback_failed_download_{type(e).__name__}"
+            
+            subtitle_files = list(Path(temp_dir).glob(f'{video_id}*.vtt'))
+            
+            if not subtitle_files:
+                logger.info("No subtitle files found")
+                return None, None, "fallback_failed_no_subtitle_files"
+            
+            subtitle_file = subtitle_files[0]
+            logger.debug("Reading subtitle file: %s", subtitle_file.name)
+            
             try:
-                logger.info("Downloading subtitles with yt-dlp...")
-                ydl.download([f'https://www.youtube.com/watch?v={video_id}'])
+                transcript_text = parse_vtt_file(subtitle_file)
             except Exception as e:
-                logger.info(f"yt-dlp download failed: {str(e)}")
-                return None, None, f"fallback_failed_download_{type(e).__name__}"
-        
-        subtitle_files = []
-        for file in os.listdir(temp_dir):
-            if file.startswith(video_id) and file.endswith('.vtt'):
-                subtitle_files.append(os.path.join(temp_dir, file))
-        
-        if not subtitle_files:
-            logger.info("No subtitle files found")
-            try:
-                for file in os.listdir(temp_dir):
-                    os.remove(os.path.join(temp_dir, file))
-                os.rmdir(temp_dir)
-            except:
-                pass
-            return None, None, "fallback_failed_no_subtitle_files"
-        
-        subtitle_file = subtitle_files[0]
-        logger.info(f"Reading subtitle file: {os.path.basename(subtitle_file)}")
-        
-        try:
-            with open(subtitle_file, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-        except Exception as e:
-            logger.info(f"Could not read subtitle file: {str(e)}")
-            return None, None, f"fallback_failed_read_{type(e).__name__}"
-        
-        transcript_text = parse_vtt_content(vtt_content)
+                logger.info("Could not read subtitle file: %s", e)
+                return None, None, f"fallback_failed_read_{type(e).__name__}"
         
         if not transcript_text:
             logger.info("Could not parse VTT content")
@@ -206,24 +333,27 @@ def get_transcript_fallback_method(video_id: str) -> Tuple[Optional[str], Option
         
         transcript_data = [{"text": transcript_text, "start": 0.0}]
         
-        try:
-            for file in os.listdir(temp_dir):
-                os.remove(os.path.join(temp_dir, file))
-            os.rmdir(temp_dir)
-        except:
-            pass
-        
-        logger.info(f"SUCCESS! Extracted {len(transcript_text)} characters using yt-dlp")
+        logger.info("SUCCESS! Extracted %s characters using yt-dlp", len(transcript_text))
         return transcript_text, transcript_data, "yt-dlp"
         
     except Exception as e:
-        logger.info(f"Fallback method unexpected error: {str(e)}")
+        logger.info("Fallback method unexpected error: %s", e)
         return None, None, f"fallback_failed_unexpected_{type(e).__name__}"
 
 def parse_vtt_content(vtt_content: str) -> Optional[str]:
     """Parse VTT (WebVTT) subtitle content and extract text."""
-    lines = vtt_content.split('\n')
+    return parse_vtt_lines(vtt_content.split('\n'))
+
+def parse_vtt_file(path: Union[str, Path]) -> Optional[str]:
+    """Parse a VTT file line by line without reading it into memory first."""
+    # newline='\n' splits exactly like str.split('\n'); strip() drops any '\r'
+    with open(path, 'r', encoding='utf-8', newline='\n') as f:
+        return parse_vtt_lines(f)
+
+def parse_vtt_lines(lines: Iterable[str]) -> Optional[str]:
+    """Extract caption text from an iterable of VTT lines."""
     text_parts = []
+    previous = None
     
     for line in lines:
         line = line.strip()
@@ -235,32 +365,115 @@ def parse_vtt_content(vtt_content: str) -> Optional[str]:
             not line):
             continue
         
-        line = re.sub(r'<[^>]+>', '', line)
+        # Most caption lines carry no inline tags, so skip the regex for those
+        if '<' in line:
+            line = _VTT_TAG_RE.sub('', line)
         
-        if line:
+        # Auto-generated captions roll, repeating each line in the following cue
+        if line and line != previous:
             text_parts.append(line)
+            previous = line
     
     return ' '.join(text_parts) if text_parts else None
 
+def _read_cache_entry(cache_file: str) -> Optional[Dict[str, Any]]:
+    """Read a JSON cache file, or None if it is missing, expired or unreadable."""
+    try:
+        if time.time() - os.path.getmtime(cache_file) > CACHE_TTL:
+            return None
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_cache_entry(cache_file: str, entry: Dict[str, Any]) -> None:
+    """Atomically write a JSON cache file; failures are only logged."""
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        # A unique temp file per writer: worker threads may store the same entry at once
+        fd, temp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_file, cache_file)
+        except BaseException:
+            os.unlink(temp_file)
+            raise
+    except Exception as e:
+        logger.warning("Could not write cache file %s: %s", cache_file, e)
+
+def _safe_id(video_id: str) -> str:
+    """Replace the characters _SAFE_ID_RE matches so video_id is safe in a file name."""
+    if video_id.isascii():
+        return video_id.translate(_SAFE_ID_TABLE)
+    return _SAFE_ID_RE.sub('_', video_id)
+
+def load_cached_transcript(video_id: str) -> Optional[Tuple[str, Any, str]]:
+    """Return a cached (text, data, method) extraction for video_id, if any."""
+    entry = _read_cache_entry(os.path.join(CACHE_DIR, f"{_safe_id(video_id)}.json"))
+    try:
+        return entry['text'], entry['data'], entry['method']
+    except (KeyError, TypeError):
+        return None
+
+def store_cached_transcript(video_id: str, result: Tuple[str, Any, str]) -> None:
+    """Cache a successful extraction for video_id."""
+    transcript_text, transcript_data, method = result
+    try:
+        json.dumps(transcript_data)
+    except TypeError:
+        # Library transcript objects are not JSON serializable; keep the text-only shape
+        transcript_data = [{"text": transcript_text, "start": 0.0}]
+    _write_cache_entry(
+        os.path.join(CACHE_DIR, f"{_safe_id(video_id)}.json"),
+        {'text': transcript_text, 'data': transcript_data, 'method': method}
+    )
+
+def _analysis_cache_path(transcript: str) -> str:
+    digest = hashlib.blake2b(transcript.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(ANALYSIS_CACHE_DIR, f"{digest}.json")
+
 def get_transcript_robust(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
-    """Robust transcript extraction with primary method + fallback."""
-    logger.info(f"Starting robust transcript extraction for {video_id}")
+    """Robust transcript extraction with primary method + fallback, for callers without an event loop."""
+    return asyncio.run(get_transcript_robust_async(video_id))
+
+async def get_transcript_robust_async(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
+    """Robust transcript extraction with primary method + fallback; each method runs in a worker thread so the event loop stays free."""
+    cached = await asyncio.to_thread(load_cached_transcript, video_id)
+    if cached:
+        logger.info("Using cached transcript for %s", video_id)
+        return cached
+    
+    logger.debug("Starting robust transcript extraction for %s", video_id)
     
-    transcript_text, transcript_data, method = get_transcript_primary_method(video_id)
+    transcript_text, transcript_data, method = await asyncio.to_thread(get_transcript_primary_method, video_id)
     
     if transcript_text:
+        await asyncio.to_thread(store_cached_transcript, video_id, (transcript_text, transcript_data, method))
         return transcript_text, transcript_data, method
     
-    logger.info("Primary method failed, trying fallback...")
+    logger.debug("Primary method failed, trying fallback...")
     
-    transcript_text, transcript_data, method = get_transcript_fallback_method(video_id)
+    transcript_text, transcript_data, method = await asyncio.to_thread(get_transcript_fallback_method, video_id)
     
     if transcript_text:
+        await asyncio.to_thread(store_cached_transcript, video_id, (transcript_text, transcript_data, method))
         return transcript_text, transcript_data, method
     
     logger.info("All methods failed")
     return None, None, "all_methods_failed"
 
+async def get_transcripts_batch(video_ids: List[str], concurrency: int = BATCH_CONCURRENCY) -> List[Tuple[Optional[str], Optional[Dict], str]]:
+    """Fetch transcripts for several videos concurrently, at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_one(video_id: str) -> Tuple[Optional[str], Optional[Dict], str]:
+        async with semaphore:
+            return await get_transcript_robust_async(video_id)
+    
+    return await asyncio.gather(*(fetch_one(video_id) for video_id in video_ids))
+
 def get_video_info(video_id: str) -> Dict[str, str]:
     """Get basic video information."""
     return {
@@ -308,17 +521,32 @@ class ContentAnalyzer:
             'gaming': ['game', 'gaming', 'esports', 'stream', 'twitch', 'console'],
             'lifestyle': ['lifestyle', 'travel', 'food', 'cooking', 'home', 'fashion']
         }
+        
+        # Last (text, sentences) split, shared by analyze_content_type and
+        # extract_key_insights, which are called back to back on the same transcript
+        self._sentence_cache = None
     
     def analyze_content_type(self, transcript: str) -> Dict[str, Any]:
         """Analyze transcript to determine content type and characteristics."""
         transcript_lower = transcript.lower()
         
-        # Count keyword occurrences
-        tutorial_score = sum(transcript_lower.count(kw) for kw in self.tutorial_keywords)
-        review_score = sum(transcript_lower.count(kw) for kw in self.review_keywords)
-        gaming_score = sum(transcript_lower.count(kw) for kw in self.gaming_keywords)
-        discussion_score = sum(transcript_lower.count(kw) for kw in self.discussion_keywords)
-        educational_score = sum(transcript_lower.count(kw) for kw in self.educational_keywords)
+        # Count keyword occurrences; words shared between lists ('guide', 'theory',
+        # 'strategy', 'game', ...) are counted once for every score that uses them
+        keyword_lists = [
+            self.tutorial_keywords, self.review_keywords, self.gaming_keywords,
+            self.discussion_keywords, self.educational_keywords,
+            *self.topic_categories.values()
+        ]
+        keyword_counts = {
+            kw: transcript_lower.count(kw)
+            for kw in dict.fromkeys(kw for keywords in keyword_lists for kw in keywords)
+        }
+        
+        tutorial_score = sum(keyword_counts[kw] for kw in self.tutorial_keywords)
+        review_score = sum(keyword_counts[kw] for kw in self.review_keywords)
+        gaming_score = sum(keyword_counts[kw] for kw in self.gaming_keywords)
+        discussion_score = sum(keyword_counts[kw] for kw in self.discussion_keywords)
+        educational_score = sum(keyword_counts[kw] for kw in self.educational_keywords)
         
         # Determine primary content type
         scores = {
@@ -335,25 +563,17 @@ class ContentAnalyzer:
         # Determine topic category
         topic_scores = {}
         for category, keywords in self.topic_categories.items():
-            topic_scores[category] = sum(transcript_lower.count(kw) for kw in keywords)
+            topic_scores[category] = sum(keyword_counts[kw] for kw in keywords)
         
         primary_topic = max(topic_scores, key=topic_scores.get) if any(topic_scores.values()) else 'general'
         
         # Analyze structural patterns
         sentences = self.split_into_sentences(transcript)
-        avg_sentence_length = statistics.mean(len(s.split()) for s in sentences if s.strip())
+        # Sentences come back stripped and non-empty, so every one counts
+        avg_sentence_length = sum(len(s.split()) for s in sentences) / max(1, len(sentences))
         
         # Detect instructional patterns
-        instructional_patterns = [
-            r'\b(first|next|then|now|finally|step \d+)\b',
-            r'\b(you need to|make sure|important|remember)\b',
-            r'\b(click|press|select|choose|go to)\b'
-        ]
-        
-        instruction_count = sum(
-            len(re.findall(pattern, transcript_lower)) 
-            for pattern in instructional_patterns
-        )
+        instruction_count = len(_INSTRUCTIONAL_RE.findall(transcript_lower))
         
         return {
             'primary_type': primary_type,
@@ -369,63 +589,54 @@ class ContentAnalyzer:
     
     def split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences with improved handling."""
-        # Handle common abbreviations
-        text = re.sub(r'\b(Mr|Mrs|Dr|Prof|Sr|Jr)\.', r'\1<DOT>', text)
+        cached = self._sentence_cache
+        if cached is not None and (cached[0] is text or cached[0] == text):
+            return cached[1]
         
-        # Split on sentence endings
-        sentences = re.split(r'[.!?]+', text)
-        
-        # Restore abbreviations and clean up
+        # Split on sentence endings (abbreviations are skipped by the pattern itself).
+        # Any dot left in a piece belongs to an abbreviation; each one counts as five
+        # characters toward the minimum length, so short 'Dr. Smith' fragments are kept.
         sentences = [
-            s.replace('<DOT>', '.').strip() 
-            for s in sentences 
-            if s.strip() and len(s.strip()) > 10
+            s for s in map(str.strip, _SENTENCE_END_RE.split(text))
+            if len(s) + 4 * s.count('.') > 10
         ]
         
+        self._sentence_cache = (text, sentences)
         return sentences
     
     def extract_key_insights(self, transcript: str, content_analysis: Dict[str, Any]) -> List[Dict[str, str]]:
         """Extract key insights based on content type."""
         sentences = self.split_into_sentences(transcript)
+        sentences_lower = [s.lower() for s in sentences]
         insights = []
         
         content_type = content_analysis['primary_type']
         
         if content_type == 'tutorial':
-            insights = self._extract_tutorial_insights(sentences)
+            insights = self._extract_tutorial_insights(sentences, sentences_lower, MAX_INSIGHTS)
         elif content_type == 'review':
-            insights = self._extract_review_insights(sentences)
+            insights = self._extract_review_insights(sentences, sentences_lower, MAX_INSIGHTS)
         elif content_type == 'gaming':
-            insights = self._extract_gaming_insights(sentences)
+            insights = self._extract_gaming_insights(sentences, sentences_lower, MAX_INSIGHTS)
         elif content_type == 'discussion':
-            insights = self._extract_discussion_insights(sentences)
+            insights = self._extract_discussion_insights(sentences, sentences_lower, MAX_INSIGHTS)
         elif content_type == 'educational':
-            insights = self._extract_educational_insights(sentences)
+            insights = self._extract_educational_insights(sentences, sentences_lower, MAX_INSIGHTS)
         else:
-            insights = self._extract_general_insights(sentences)
+            insights = self._extract_general_insights(sentences, sentences_lower, MAX_INSIGHTS)
         
-        return insights[:12]  # Limit to top 12 insights
+        return insights[:MAX_INSIGHTS]
     
-    def _extract_tutorial_insights(self, sentences: List[str]) -> List[Dict[str, str]]:
+    def _extract_tutorial_insights(self, sentences: List[str], sentences_lower: List[str], limit: int = MAX_INSIGHTS) -> List[Dict[str, str]]:
         """Extract insights from tutorial content."""
         insights = []
         
-        step_patterns = [
-            r'\b(first|next|then|now|finally|step \d+)\b',
-            r'\b(install|download|create|setup|configure)\b',
-            r'\b(click|press|select|choose|go to)\b'
-        ]
-        
-        important_patterns = [
-            r'\b(important|crucial|essential|make sure|remember)\b',
-            r'\b(warning|caution|careful|avoid)\b'
-        ]
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence, sentence_lower in zip(sentences, sentences_lower):
+            if len(insights) >= limit:
+                break
             
             # Check for step indicators
-            if any(re.search(pattern, sentence_lower) for pattern in step_patterns):
+            if _STEP_RE.search(sentence_lower):
                 insights.append({
                     'type': 'action',
                     'content': sentence.strip(),
@@ -433,7 +644,7 @@ class ContentAnalyzer:
                 })
             
             # Check for important notes
-            elif any(re.search(pattern, sentence_lower) for pattern in important_patterns):
+            elif _IMPORTANT_RE.search(sentence_lower):
                 insights.append({
                     'type': 'important',
                     'content': sentence.strip(),
@@ -442,42 +653,29 @@ class ContentAnalyzer:
         
         return insights
     
-    def _extract_review_insights(self, sentences: List[str]) -> List[Dict[str, str]]:
+    def _extract_review_insights(self, sentences: List[str], sentences_lower: List[str], limit: int = MAX_INSIGHTS) -> List[Dict[str, str]]:
         """Extract insights from review content."""
         insights = []
         
-        positive_patterns = [
-            r'\b(good|great|excellent|amazing|love|like|impressed|solid|recommend)\b',
-            r'\b(pros?|advantages?|benefits?|strengths?)\b'
-        ]
-        
-        negative_patterns = [
-            r'\b(bad|terrible|awful|hate|disappointing|issues?|problems?|buggy)\b',
-            r'\b(cons?|disadvantages?|weaknesses?|flaws?)\b'
-        ]
-        
-        feature_patterns = [
-            r'\b(feature|functionality|system|performance|quality|design)\b'
-        ]
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence, sentence_lower in zip(sentences, sentences_lower):
+            if len(insights) >= limit:
+                break
             
-            if any(re.search(pattern, sentence_lower) for pattern in positive_patterns):
+            if _POSITIVE_RE.search(sentence_lower):
                 insights.append({
                     'type': 'positive',
                     'content': sentence.strip(),
                     'category': 'Strength'
                 })
             
-            elif any(re.search(pattern, sentence_lower) for pattern in negative_patterns):
+            elif _NEGATIVE_RE.search(sentence_lower):
                 insights.append({
                     'type': 'negative',
                     'content': sentence.strip(),
                     'category': 'Weakness'
                 })
             
-            elif any(re.search(pattern, sentence_lower) for pattern in feature_patterns):
+            elif _FEATURE_RE.search(sentence_lower):
                 insights.append({
                     'type': 'feature',
                     'content': sentence.strip(),
@@ -486,30 +684,22 @@ class ContentAnalyzer:
         
         return insights
     
-    def _extract_gaming_insights(self, sentences: List[str]) -> List[Dict[str, str]]:
+    def _extract_gaming_insights(self, sentences: List[str], sentences_lower: List[str], limit: int = MAX_INSIGHTS) -> List[Dict[str, str]]:
         """Extract insights from gaming content."""
         insights = []
         
-        strategy_patterns = [
-            r'\b(strategy|tactic|tip|trick|build|combo|meta)\b',
-            r'\b(best|optimal|effective|powerful|strong)\b'
-        ]
-        
-        gameplay_patterns = [
-            r'\b(gameplay|mechanics|system|combat|level|quest)\b'
-        ]
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence, sentence_lower in zip(sentences, sentences_lower):
+            if len(insights) >= limit:
+                break
             
-            if any(re.search(pattern, sentence_lower) for pattern in strategy_patterns):
+            if _STRATEGY_RE.search(sentence_lower):
                 insights.append({
                     'type': 'strategy',
                     'content': sentence.strip(),
                     'category': 'Strategy/Tip'
                 })
             
-            elif any(re.search(pattern, sentence_lower) for pattern in gameplay_patterns):
+            elif _GAMEPLAY_RE.search(sentence_lower):
                 insights.append({
                     'type': 'gameplay',
                     'content': sentence.strip(),
@@ -518,31 +708,22 @@ class ContentAnalyzer:
         
         return insights
     
-    def _extract_discussion_insights(self, sentences: List[str]) -> List[Dict[str, str]]:
+    def _extract_discussion_insights(self, sentences: List[str], sentences_lower: List[str], limit: int = MAX_INSIGHTS) -> List[Dict[str, str]]:
         """Extract insights from discussion content."""
         insights = []
         
-        opinion_patterns = [
-            r'\b(think|believe|opinion|perspective|view|feel)\b',
-            r'\b(argue|claim|suggest|propose|theorize)\b'
-        ]
-        
-        fact_patterns = [
-            r'\b(research|study|data|statistics|evidence|proof)\b',
-            r'\b(according to|studies show|research indicates)\b'
-        ]
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence, sentence_lower in zip(sentences, sentences_lower):
+            if len(insights) >= limit:
+                break
             
-            if any(re.search(pattern, sentence_lower) for pattern in opinion_patterns):
+            if _OPINION_RE.search(sentence_lower):
                 insights.append({
                     'type': 'opinion',
                     'content': sentence.strip(),
                     'category': 'Opinion/Perspective'
                 })
             
-            elif any(re.search(pattern, sentence_lower) for pattern in fact_patterns):
+            elif _FACT_RE.search(sentence_lower):
                 insights.append({
                     'type': 'fact',
                     'content': sentence.strip(),
@@ -551,31 +732,22 @@ class ContentAnalyzer:
         
         return insights
     
-    def _extract_educational_insights(self, sentences: List[str]) -> List[Dict[str, str]]:
+    def _extract_educational_insights(self, sentences: List[str], sentences_lower: List[str], limit: int = MAX_INSIGHTS) -> List[Dict[str, str]]:
         """Extract insights from educational content."""
         insights = []
         
-        concept_patterns = [
-            r'\b(concept|principle|theory|law|rule|definition)\b',
-            r'\b(explain|understand|means|defined as|refers to)\b'
-        ]
-        
-        example_patterns = [
-            r'\b(example|instance|case|illustration|demonstration)\b',
-            r'\b(for example|such as|like|including)\b'
-        ]
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence, sentence_lower in zip(sentences, sentences_lower):
+            if len(insights) >= limit:
+                break
             
-            if any(re.search(pattern, sentence_lower) for pattern in concept_patterns):
+            if _CONCEPT_RE.search(sentence_lower):
                 insights.append({
                     'type': 'concept',
                     'content': sentence.strip(),
                     'category': 'Key Concept'
                 })
             
-            elif any(re.search(pattern, sentence_lower) for pattern in example_patterns):
+            elif _EXAMPLE_RE.search(sentence_lower):
                 insights.append({
                     'type': 'example',
                     'content': sentence.strip(),
@@ -584,20 +756,15 @@ class ContentAnalyzer:
         
         return insights
     
-    def _extract_general_insights(self, sentences: List[str]) -> List[Dict[str, str]]:
+    def _extract_general_insights(self, sentences: List[str], sentences_lower: List[str], limit: int = MAX_INSIGHTS) -> List[Dict[str, str]]:
         """Extract general insights from any content."""
         insights = []
         
-        key_patterns = [
-            r'\b(important|key|main|primary|essential|crucial)\b',
-            r'\b(remember|note|realize|understand|consider)\b',
-            r'\b(interesting|surprising|remarkable|notable)\b'
-        ]
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
+        for sentence, sentence_lower in zip(sentences, sentences_lower):
+            if len(insights) >= limit:
+                break
             
-            if any(re.search(pattern, sentence_lower) for pattern in key_patterns):
+            if _KEY_RE.search(sentence_lower):
                 insights.append({
                     'type': 'key_point',
                     'content': sentence.strip(),
@@ -606,10 +773,13 @@ class ContentAnalyzer:
         
         # If no specific insights found, extract sentences with high information density
         if len(insights) < 5:
-            for sentence in sentences:
-                if (len(sentence.split()) > 10 and 
-                    len(sentence.split()) < 30 and
-                    not sentence.lower().startswith(('um', 'uh', 'like', 'you know'))):
+            for sentence, sentence_lower in zip(sentences, sentences_lower):
+                if len(insights) >= limit:
+                    break
+                
+                word_count = len(sentence.split())
+                if (10 < word_count < 30 and
+                    not sentence_lower.startswith(('um', 'uh', 'like', 'you know'))):
                     insights.append({
                         'type': 'general',
                         'content': sentence.strip(),
@@ -618,33 +788,52 @@ class ContentAnalyzer:
         
         return insights
 
-def generate_enhanced_checklist(transcript: str, video_info: Dict[str, str]) -> str:
-    """Generate enhanced checklist using advanced content analysis."""
-    logger.info("Starting enhanced checklist generation...")
+# Shared analyzer: the keyword tables are built once and the sentence split is
+# reused across the analysis calls made for one transcript
+_ANALYZER = ContentAnalyzer()
+
+async def build_enhanced_checklist(transcript: str, video_info: Dict[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """Generate the enhanced checklist together with the content analysis it is based on."""
+    logger.debug("Starting enhanced checklist generation...")
     
-    # Initialize content analyzer
-    analyzer = ContentAnalyzer()
+    analyzer = _ANALYZER
     
     # Truncate transcript if too long
-    if len(transcript) > 20000:
-        logger.info(f"Transcript is {len(transcript)} characters - using first 20000 for analysis")
-        working_transcript = transcript[:20000] + "\n\n[Note: Transcript truncated for processing]"
+    if len(transcript) > ANALYSIS_CHAR_LIMIT:
+        logger.debug("Transcript is %s characters - using first %s for analysis", len(transcript), ANALYSIS_CHAR_LIMIT)
+        working_transcript = transcript[:ANALYSIS_CHAR_LIMIT] + "\n\n[Note: Transcript truncated for processing]"
     else:
         working_transcript = transcript
     
-    # Analyze content
-    content_analysis = analyzer.analyze_content_type(working_transcript)
-    logger.info(f"Content analysis: {content_analysis['primary_type']} ({content_analysis['confidence']:.2f} confidence)")
-    
-    # Extract insights
-    insights = analyzer.extract_key_insights(working_transcript, content_analysis)
-    logger.info(f"Extracted {len(insights)} key insights")
+    # Reuse a cached analysis of the same transcript; the checklist itself is rebuilt
+    # every time because it carries the generation timestamp. Cache file I/O runs in a
+    # worker thread so other requests keep being served meanwhile
+    cache_file = _analysis_cache_path(working_transcript)
+    cached = await asyncio.to_thread(_read_cache_entry, cache_file)
+    if cached and 'content_analysis' in cached and 'insights' in cached:
+        content_analysis = cached['content_analysis']
+        insights = cached['insights']
+        logger.debug("Using cached content analysis")
+    else:
+        # Analyze content
+        content_analysis = analyzer.analyze_content_type(working_transcript)
+        logger.debug("Content analysis: %s (%.2f confidence)", content_analysis['primary_type'], content_analysis['confidence'])
+        
+        # Extract insights
+        insights = analyzer.extract_key_insights(working_transcript, content_analysis)
+        logger.debug("Extracted %s key insights", len(insights))
+        
+        await asyncio.to_thread(_write_cache_entry, cache_file, {'content_analysis': content_analysis, 'insights': insights})
     
     # Generate checklist based on content type
     checklist = generate_checklist_by_type(content_analysis, insights, video_info, working_transcript)
     
-    logger.info("Enhanced checklist generation complete!")
-    return checklist
+    logger.debug("Enhanced checklist generation complete!")
+    return checklist, content_analysis
+
+def generate_enhanced_checklist(transcript: str, video_info: Dict[str, str]) -> str:
+    """Generate enhanced checklist using advanced content analysis, for callers without an event loop."""
+    return asyncio.run(build_enhanced_checklist(transcript, video_info))[0]
 
 def generate_checklist_by_type(content_analysis: Dict[str, Any], insights: List[Dict[str, str]], 
                               video_info: Dict[str, str], transcript: str) -> str:
@@ -683,190 +872,178 @@ def generate_checklist_by_type(content_analysis: Dict[str, Any], insights: List[
     else:
         return header + generate_general_checklist(insights, content_analysis)
 
+def _bucket_by_type(insights: List[Dict[str, str]]) -> Dict[str, List[Dict[str, str]]]:
+    """Group insights by their 'type' in a single pass, keeping their order."""
+    groups = defaultdict(list)
+    for insight in insights:
+        groups[insight['type']].append(insight)
+    return groups
+
 def generate_tutorial_checklist(insights: List[Dict[str, str]], content_analysis: Dict[str, Any]) -> str:
     """Generate checklist for tutorial content."""
-    checklist = "## Tutorial Checklist\n\n"
+    parts = ["## Tutorial Checklist\n\n"]
     
     # Group insights by type
-    actions = [i for i in insights if i['type'] == 'action']
-    important = [i for i in insights if i['type'] == 'important']
+    groups = _bucket_by_type(insights)
+    actions = groups['action']
+    important = groups['important']
     
     if actions:
-        checklist += "### Steps to Follow\n"
+        parts.append("### Steps to Follow\n")
         for i, insight in enumerate(actions[:10], 1):
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Step {i}:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Step {i}:** {clean_content}\n")
+        parts.append("\n")
     
     if important:
-        checklist += "### Important Notes\n"
+        parts.append("### Important Notes\n")
         for insight in important[:5]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Remember:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Remember:** {clean_content}\n")
+        parts.append("\n")
     
     # Add generic tutorial items if not enough specific insights
     if len(actions) < 3:
-        checklist += "### General Tutorial Guidelines\n"
-        checklist += "- [ ] **Prepare:** Gather all necessary tools and materials\n"
-        checklist += "- [ ] **Follow along:** Watch the video step by step\n"
-        checklist += "- [ ] **Practice:** Try each step yourself\n"
-        checklist += "- [ ] **Verify:** Check your results match the tutorial\n"
+        parts.append(_TUTORIAL_GUIDELINES)
     
-    return checklist
+    return ''.join(parts)
 
 def generate_review_checklist(insights: List[Dict[str, str]], content_analysis: Dict[str, Any]) -> str:
     """Generate checklist for review content."""
-    checklist = "## Review Analysis Checklist\n\n"
+    parts = ["## Review Analysis Checklist\n\n"]
     
     # Group insights by type
-    positives = [i for i in insights if i['type'] == 'positive']
-    negatives = [i for i in insights if i['type'] == 'negative']
-    features = [i for i in insights if i['type'] == 'feature']
+    groups = _bucket_by_type(insights)
+    positives = groups['positive']
+    negatives = groups['negative']
+    features = groups['feature']
     
     if positives:
-        checklist += "### Positive Points to Consider\n"
+        parts.append("### Positive Points to Consider\n")
         for insight in positives[:5]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Strength:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Strength:** {clean_content}\n")
+        parts.append("\n")
     
     if negatives:
-        checklist += "### Concerns to Evaluate\n"
+        parts.append("### Concerns to Evaluate\n")
         for insight in negatives[:5]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Concern:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Concern:** {clean_content}\n")
+        parts.append("\n")
     
     if features:
-        checklist += "### Features to Analyze\n"
+        parts.append("### Features to Analyze\n")
         for insight in features[:5]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Feature:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Feature:** {clean_content}\n")
+        parts.append("\n")
     
-    checklist += "### Decision Framework\n"
-    checklist += "- [ ] **Weigh pros vs cons** based on reviewer's analysis\n"
-    checklist += "- [ ] **Consider your specific needs** and use case\n"
-    checklist += "- [ ] **Research additional reviews** for comparison\n"
-    checklist += "- [ ] **Make informed decision** based on all factors\n"
+    parts.append(_REVIEW_DECISION_FRAMEWORK)
     
-    return checklist
+    return ''.join(parts)
 
 def generate_gaming_checklist(insights: List[Dict[str, str]], content_analysis: Dict[str, Any]) -> str:
     """Generate checklist for gaming content."""
-    checklist = "## Gaming Guide Checklist\n\n"
+    parts = ["## Gaming Guide Checklist\n\n"]
     
     # Group insights by type
-    strategies = [i for i in insights if i['type'] == 'strategy']
-    gameplay = [i for i in insights if i['type'] == 'gameplay']
+    groups = _bucket_by_type(insights)
+    strategies = groups['strategy']
+    gameplay = groups['gameplay']
     
     if strategies:
-        checklist += "### Strategies & Tips\n"
+        parts.append("### Strategies & Tips\n")
         for insight in strategies[:6]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Strategy:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Strategy:** {clean_content}\n")
+        parts.append("\n")
     
     if gameplay:
-        checklist += "### Gameplay Elements\n"
+        parts.append("### Gameplay Elements\n")
         for insight in gameplay[:6]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Gameplay:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Gameplay:** {clean_content}\n")
+        parts.append("\n")
     
-    checklist += "### Gaming Action Items\n"
-    checklist += "- [ ] **Practice the techniques** mentioned in the video\n"
-    checklist += "- [ ] **Apply strategies** in your own gameplay\n"
-    checklist += "- [ ] **Test different approaches** to find what works for you\n"
-    checklist += "- [ ] **Track your progress** and improvement\n"
+    parts.append(_GAMING_ACTIONS)
     
-    return checklist
+    return ''.join(parts)
 
 def generate_discussion_checklist(insights: List[Dict[str, str]], content_analysis: Dict[str, Any]) -> str:
     """Generate checklist for discussion content."""
-    checklist = "## Discussion Points & Insights\n\n"
+    parts = ["## Discussion Points & Insights\n\n"]
     
     # Group insights by type
-    opinions = [i for i in insights if i['type'] == 'opinion']
-    facts = [i for i in insights if i['type'] == 'fact']
+    groups = _bucket_by_type(insights)
+    opinions = groups['opinion']
+    facts = groups['fact']
     
     if facts:
-        checklist += "### Key Evidence & Research\n"
+        parts.append("### Key Evidence & Research\n")
         for insight in facts[:5]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Evidence:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Evidence:** {clean_content}\n")
+        parts.append("\n")
     
     if opinions:
-        checklist += "### Perspectives & Opinions\n"
+        parts.append("### Perspectives & Opinions\n")
         for insight in opinions[:6]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Perspective:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Perspective:** {clean_content}\n")
+        parts.append("\n")
     
-    checklist += "### Critical Thinking Actions\n"
-    checklist += "- [ ] **Evaluate the arguments** presented in the discussion\n"
-    checklist += "- [ ] **Research supporting evidence** for key claims\n"
-    checklist += "- [ ] **Consider alternative viewpoints** not discussed\n"
-    checklist += "- [ ] **Form your own informed opinion** on the topic\n"
+    parts.append(_DISCUSSION_ACTIONS)
     
-    return checklist
+    return ''.join(parts)
 
 def generate_educational_checklist(insights: List[Dict[str, str]], content_analysis: Dict[str, Any]) -> str:
     """Generate checklist for educational content."""
-    checklist = "## Educational Learning Checklist\n\n"
+    parts = ["## Educational Learning Checklist\n\n"]
     
     # Group insights by type
-    concepts = [i for i in insights if i['type'] == 'concept']
-    examples = [i for i in insights if i['type'] == 'example']
+    groups = _bucket_by_type(insights)
+    concepts = groups['concept']
+    examples = groups['example']
     
     if concepts:
-        checklist += "### Key Concepts to Understand\n"
+        parts.append("### Key Concepts to Understand\n")
         for insight in concepts[:6]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Concept:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Concept:** {clean_content}\n")
+        parts.append("\n")
     
     if examples:
-        checklist += "### Examples & Applications\n"
+        parts.append("### Examples & Applications\n")
         for insight in examples[:5]:
             clean_content = clean_sentence(insight['content'])
-            checklist += f"- [ ] **Example:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **Example:** {clean_content}\n")
+        parts.append("\n")
     
-    checklist += "### Learning Actions\n"
-    checklist += "- [ ] **Review key concepts** until clearly understood\n"
-    checklist += "- [ ] **Practice with examples** provided in the video\n"
-    checklist += "- [ ] **Find additional resources** on the topic\n"
-    checklist += "- [ ] **Test your understanding** with practice problems\n"
+    parts.append(_LEARNING_ACTIONS)
     
-    return checklist
+    return ''.join(parts)
 
 def generate_general_checklist(insights: List[Dict[str, str]], content_analysis: Dict[str, Any]) -> str:
     """Generate checklist for general content."""
-    checklist = "## Key Points & Takeaways\n\n"
+    parts = ["## Key Points & Takeaways\n\n"]
     
     if insights:
-        checklist += "### Main Points to Remember\n"
+        parts.append("### Main Points to Remember\n")
         for insight in insights[:8]:
             clean_content = clean_sentence(insight['content'])
             category = insight.get('category', 'Point')
-            checklist += f"- [ ] **{category}:** {clean_content}\n"
-        checklist += "\n"
+            parts.append(f"- [ ] **{category}:** {clean_content}\n")
+        parts.append("\n")
     
-    checklist += "### Follow-up Actions\n"
-    checklist += "- [ ] **Reflect on the main message** of the video\n"
-    checklist += "- [ ] **Identify actionable insights** relevant to you\n"
-    checklist += "- [ ] **Research additional information** on topics of interest\n"
-    checklist += "- [ ] **Apply relevant concepts** to your own situation\n"
+    parts.append(_FOLLOW_UP_ACTIONS)
     
-    return checklist
+    return ''.join(parts)
 
 def clean_sentence(sentence: str) -> str:
     """Clean and format sentence for checklist display."""
     # Remove common speech fillers
-    sentence = re.sub(r'\b(um|uh|you know|like|basically|actually|literally)\b', '', sentence, flags=re.IGNORECASE)
+    sentence = _FILLER_RE.sub('', sentence)
     
     # Clean up extra spaces
     sentence = ' '.join(sentence.split())
@@ -881,84 +1058,116 @@ def clean_sentence(sentence: str) -> str:
     
     return sentence
 
-def save_enhanced_results(video_info: Dict[str, str], transcript: str, transcript_data: List[Dict], 
+def _ensure_output_dir() -> str:
+    """Create the output directory once per process, falling back to the working directory."""
+    global _output_dir
+    if _output_dir is None:
+        try:
+            os.makedirs(OUTPUT_DIR, exist_ok=True)
+            _output_dir = OUTPUT_DIR
+        except OSError:
+            _output_dir = "."
+    return _output_dir
+
+def _write_transcript_file(path: str, video_info: Dict[str, str], transcript: str,
+                           method_used: str, content_analysis: Dict[str, Any], now: datetime) -> None:
+    """Write the transcript file with its analysis header."""
+    lines = [
+        "YouTube Video Enhanced Transcript Analysis\n",
+        "=========================================\n\n",
+        f"Video ID: {video_info['video_id']}\n",
+        f"Title: {video_info.get('title', 'Unknown')}\n",
+        f"URL: {video_info['url']}\n",
+        f"Extraction Method: {method_used}\n",
+        f"Content Type: {content_analysis['primary_type']} (Confidence: {content_analysis['confidence']:.1%})\n",
+        f"Primary Topic: {content_analysis['primary_topic']}\n",
+        f"Extracted: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+        "CONTENT ANALYSIS:\n",
+        "=" * 50 + "\n",
+    ]
+    lines.extend(f"{key}: {value}\n" for key, value in content_analysis.items())
+    lines.append("\nTRANSCRIPT:\n" + "=" * 50 + "\n\n")
+    
+    # One write for the header, one for the transcript, which is already a single string
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(lines))
+        f.write(transcript)
+
+def _write_analysis_file(path: str, video_info: Dict[str, str], transcript_data: List[Dict],
+                         method_used: str, content_analysis: Dict[str, Any], now: datetime) -> None:
+    """Write the JSON analysis file."""
+    # Serialize before opening so a payload that can't be encoded leaves no partial file
+    payload = _dumps_pretty({
+        'video_info': video_info,
+        'content_analysis': content_analysis,
+        'transcript_data': transcript_data,
+        'extraction_method': method_used,
+        'processed_at': now.isoformat(),
+        'version': '2.0.0_enhanced'
+    })
+    
+    with open(path, 'wb') as f:
+        f.write(payload)
+
+def _write_checklist_file(path: str, checklist: str, method_used: str) -> None:
+    """Write the Markdown checklist file."""
+    enhanced_checklist = f"*Enhanced content analysis using AI v2.0 - Method: {method_used}*\n\n" + checklist
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(enhanced_checklist)
+
+async def save_enhanced_results(video_info: Dict[str, str], transcript: str, transcript_data: List[Dict], 
                          checklist: str, method_used: str, content_analysis: Dict[str, Any]) -> Dict[str, str]:
     """Save all results with enhanced analysis information."""
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_video_id = re.sub(r'[^\w\-_]', '_', video_info['video_id'])
+    # One clock reading for the file names and the timestamps written inside the files
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    safe_video_id = _safe_id(video_info['video_id'])
     
-    base_path = "C:\\Users\\ruben\\Claude Tools\\projects\\ai-tools\\youtube-checklister\\outputs"
+    file_prefix = os.path.join(_ensure_output_dir(), f"{safe_video_id}_{timestamp}")
     
-    try:
-        os.makedirs(base_path, exist_ok=True)
-    except:
-        base_path = "."
+    transcript_file = f"{file_prefix}_transcript.txt"
+    json_file = f"{file_prefix}_analysis.json"
+    checklist_file = f"{file_prefix}_ENHANCED_CHECKLIST.md"
     
-    files_created = {}
-    
-    # Save transcript with analysis
-    transcript_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_transcript.txt")
-    try:
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write(f"YouTube Video Enhanced Transcript Analysis\n")
-            f.write(f"=========================================\n\n")
-            f.write(f"Video ID: {video_info['video_id']}\n")
-            f.write(f"Title: {video_info.get('title', 'Unknown')}\n")
-            f.write(f"URL: {video_info['url']}\n")
-            f.write(f"Extraction Method: {method_used}\n")
-            f.write(f"Content Type: {content_analysis['primary_type']} (Confidence: {content_analysis['confidence']:.1%})\n")
-            f.write(f"Primary Topic: {content_analysis['primary_topic']}\n")
-            f.write(f"Extracted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write("CONTENT ANALYSIS:\n")
-            f.write("=" * 50 + "\n")
-            for key, value in content_analysis.items():
-                f.write(f"{key}: {value}\n")
-            f.write("\n")
-            f.write("TRANSCRIPT:\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(transcript)
-        files_created['transcript'] = transcript_file
-    except Exception as e:
-        logger.warning(f"Could not save transcript: {e}")
+    # The three files are independent, so write them concurrently off the event loop
+    results = await asyncio.gather(
+        asyncio.to_thread(_write_transcript_file, transcript_file, video_info, transcript, method_used, content_analysis, now),
+        asyncio.to_thread(_write_analysis_file, json_file, video_info, transcript_data, method_used, content_analysis, now),
+        asyncio.to_thread(_write_checklist_file, checklist_file, checklist, method_used),
+        return_exceptions=True
+    )
     
-    # Save enhanced JSON data
-    json_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_analysis.json")
-    try:
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'video_info': video_info,
-                'content_analysis': content_analysis,
-                'transcript_data': transcript_data,
-                'extraction_method': method_used,
-                'processed_at': datetime.now().isoformat(),
-                'version': '2.0.0_enhanced'
-            }, f, indent=2, ensure_ascii=False)
-        files_created['analysis'] = json_file
-    except Exception as e:
-        logger.warning(f"Could not save analysis data: {e}")
+    files_created = {}
+    saved = (
+        ('transcript', transcript_file, "transcript"),
+        ('analysis', json_file, "analysis data"),
+        ('checklist', checklist_file, "checklist"),
+    )
+    for (file_type, file_path, label), result in zip(saved, results):
+        if isinstance(result, Exception):
+            logger.warning("Could not save %s: %s", label, result)
+        else:
+            files_created[file_type] = file_path
     
-    # Save enhanced checklist
-    checklist_file = os.path.join(base_path, f"{safe_video_id}_{timestamp}_ENHANCED_CHECKLIST.md")
-    try:
-        enhanced_checklist = f"*Enhanced content analysis using AI v2.0 - Method: {method_used}*\n\n" + checklist
-        
-        with open(checklist_file, 'w', encoding='utf-8') as f:
-            f.write(enhanced_checklist)
-        files_created['checklist'] = checklist_file
-        logger.info(f"ENHANCED CHECKLIST saved: {checklist_file}")
-    except Exception as e:
-        logger.warning(f"Could not save checklist: {e}")
+    if 'checklist' in files_created:
+        logger.info("ENHANCED CHECKLIST saved: %s", checklist_file)
     
     return files_created
 
+def transcript_summary(video_id: str, transcript_text: str) -> str:
+    """Format the youtube_transcript reply for one extracted video."""
+    return f"SUCCESS: Transcript Successfully Extracted\n\nVideo ID: {video_id}\nLength: {len(transcript_text)} characters\n\nTRANSCRIPT:\n{transcript_text[:2000]}{'...' if len(transcript_text) > 2000 else ''}"
+
 # MCP Server Implementation (same as before but using enhanced functions)
 class EnhancedYouTubeMCPServer:
-    def __init__(self):
+    def __init__(self, stdout: Optional[io.RawIOBase] = None):
         self.server_info = {
             "name": "youtube-mcp-enhanced",
             "version": "2.0.0"
         }
+        self.stdout = stdout if stdout is not None else sys.stdout.buffer
     
     async def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP initialize request"""
@@ -1019,13 +1228,18 @@ class EnhancedYouTubeMCPServer:
                             "type": "string",
                             "description": "YouTube URL or video ID"
                         },
+                        "urls": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several YouTube URLs or video IDs to extract concurrently (used instead of url)"
+                        },
                         "save_file": {
                             "type": "boolean",
                             "description": "Whether to save transcript file (default: false)",
                             "default": False
                         }
                     },
-                    "required": ["url"]
+                    "required": []
                 }
             },
             {
@@ -1057,6 +1271,8 @@ class EnhancedYouTubeMCPServer:
             elif tool_name == "youtube_content_analysis":
                 return await self.youtube_content_analysis(arguments)
             elif tool_name == "youtube_transcript":
+                if arguments.get("urls"):
+                    return await self.youtube_transcript_batch(arguments)
                 return await self.youtube_transcript(arguments)
             elif tool_name == "youtube_debug":
                 return await self.youtube_debug(arguments)
@@ -1066,7 +1282,7 @@ class EnhancedYouTubeMCPServer:
                     "isError": True
                 }
         except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {str(e)}")
+            logger.error("Error executing tool %s: %s", tool_name, e)
             return {
                 "content": [{"type": "text", "text": f"Error executing {tool_name}: {str(e)}"}],
                 "isError": True
@@ -1077,7 +1293,7 @@ class EnhancedYouTubeMCPServer:
         url = arguments.get("url")
         save_files = arguments.get("save_files", True)
         
-        logger.info(f"Converting YouTube video to smart checklist: {url}")
+        logger.info("Converting YouTube video to smart checklist: %s", url)
         
         video_id = extract_video_id(url)
         if not video_id:
@@ -1087,7 +1303,7 @@ class EnhancedYouTubeMCPServer:
             }
         
         video_info = get_video_info(video_id)
-        transcript_text, transcript_data, method_used = get_transcript_robust(video_id)
+        transcript_text, transcript_data, method_used = await get_transcript_robust_async(video_id)
         
         if not transcript_text:
             return {
@@ -1095,16 +1311,12 @@ class EnhancedYouTubeMCPServer:
                 "isError": True
             }
         
-        # Use enhanced checklist generation
-        checklist = generate_enhanced_checklist(transcript_text, video_info)
-        
-        # Get content analysis for response
-        analyzer = ContentAnalyzer()
-        content_analysis = analyzer.analyze_content_type(transcript_text[:20000])
+        # Use enhanced checklist generation; its content analysis also feeds the response
+        checklist, content_analysis = await build_enhanced_checklist(transcript_text, video_info)
         
         files_created = {}
         if save_files:
-            files_created = save_enhanced_results(video_info, transcript_text, transcript_data, checklist, method_used, content_analysis)
+            files_created = await save_enhanced_results(video_info, transcript_text, transcript_data, checklist, method_used, content_analysis)
         
         response_text = f"""SUCCESS: YouTube Video Intelligently Analyzed & Converted
 
@@ -1136,7 +1348,7 @@ Transcript Length: {len(transcript_text):,} characters
         """Analyze YouTube video content without generating checklist"""
         url = arguments.get("url")
         
-        logger.info(f"Analyzing YouTube video content: {url}")
+        logger.info("Analyzing YouTube video content: %s", url)
         
         video_id = extract_video_id(url)
         if not video_id:
@@ -1146,7 +1358,7 @@ Transcript Length: {len(transcript_text):,} characters
             }
         
         video_info = get_video_info(video_id)
-        transcript_text, transcript_data, method_used = get_transcript_robust(video_id)
+        transcript_text, transcript_data, method_used = await get_transcript_robust_async(video_id)
         
         if not transcript_text:
             return {
@@ -1154,9 +1366,10 @@ Transcript Length: {len(transcript_text):,} characters
                 "isError": True
             }
         
-        analyzer = ContentAnalyzer()
-        content_analysis = analyzer.analyze_content_type(transcript_text[:20000])
-        insights = analyzer.extract_key_insights(transcript_text[:20000], content_analysis)
+        analyzer = _ANALYZER
+        analysis_slice = transcript_text[:ANALYSIS_CHAR_LIMIT]
+        content_analysis = analyzer.analyze_content_type(analysis_slice)
+        insights = analyzer.extract_key_insights(analysis_slice, content_analysis)
         
         response_text = f"""YouTube Video Content Analysis
 
@@ -1193,15 +1406,47 @@ KEY INSIGHTS EXTRACTED: {len(insights)}
             return {"content": [{"type": "text", "text": "ERROR: Invalid YouTube URL format."}], "isError": True}
         
         video_info = get_video_info(video_id)
-        transcript_text, transcript_data, method_used = get_transcript_robust(video_id)
+        transcript_text, transcript_data, method_used = await get_transcript_robust_async(video_id)
         
         if not transcript_text:
             return {"content": [{"type": "text", "text": f"ERROR: Could not extract transcript for video ID: {video_id}"}], "isError": True}
         
         # Save file logic similar to original...
-        response_text = f"SUCCESS: Transcript Successfully Extracted\n\nVideo ID: {video_id}\nLength: {len(transcript_text)} characters\n\nTRANSCRIPT:\n{transcript_text[:2000]}{'...' if len(transcript_text) > 2000 else ''}"
+        return {"content": [{"type": "text", "text": transcript_summary(video_id, transcript_text)}]}
+    
+    async def youtube_transcript_batch(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract transcripts for every entry in arguments['urls'], BATCH_CONCURRENCY at a time"""
+        urls = arguments["urls"]
+        video_ids = [extract_video_id(url) for url in urls]
         
-        return {"content": [{"type": "text", "text": response_text}]}
+        logger.info("Extracting batch of %d transcripts", len(urls))
+        
+        results = iter(await get_transcripts_batch([video_id for video_id in video_ids if video_id]))
+        
+        sections = []
+        failures = 0
+        for url, video_id in zip(urls, video_ids):
+            if not video_id:
+                failures += 1
+                sections.append(f"ERROR: Invalid YouTube URL format: {url}")
+                continue
+            transcript_text = next(results)[0]
+            if transcript_text:
+                sections.append(transcript_summary(video_id, transcript_text))
+            else:
+                failures += 1
+                sections.append(f"ERROR: Could not extract transcript for video ID: {video_id}")
+        
+        response = {
+            "content": [{
+                "type": "text",
+                "text": f"Batch Results: {len(urls) - failures} of {len(urls)} videos succeeded\n\n" +
+                        "\n\n==========\n\n".join(sections)
+            }]
+        }
+        if failures == len(urls):
+            response["isError"] = True
+        return response
     
     async def youtube_debug(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Debug YouTube transcript extraction"""
@@ -1215,63 +1460,84 @@ KEY INSIGHTS EXTRACTED: {len(insights)}
         
         # Test methods and return debug info...
         return {"content": [{"type": "text", "text": "\n".join(debug_info)}]}
-
-async def main():
-    """Main MCP server loop"""
-    server = EnhancedYouTubeMCPServer()
     
-    logger.info("Starting Enhanced YouTube MCP Server...")
-    
-    while True:
+    async def handle_message(self, line: bytes) -> None:
+        """Parse one request line, dispatch it and write the response"""
         try:
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
-            
-            if not line:
-                break
-            
-            line = line.strip()
-            if not line:
-                continue
-            
             try:
                 request = json.loads(line)
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON received: {e}")
-                continue
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.error("Invalid JSON received: %s", e)
+                return
             
             method = request.get("method")
             params = request.get("params", {})
             request_id = request.get("id")
             
             if method == "initialize":
-                result = await server.handle_initialize(params)
+                result = await self.handle_initialize(params)
             elif method == "tools/list":
-                result = await server.handle_list_tools(params)
+                result = await self.handle_list_tools(params)
             elif method == "tools/call":
-                result = await server.handle_call_tool(params)
+                result = await self.handle_call_tool(params)
             else:
-                logger.warning(f"Unknown method: {method}")
-                continue
+                logger.warning("Unknown method: %s", method)
+                return
             
-            response = {
+            self.send_message({
                 "jsonrpc": "2.0",
                 "id": request_id,
                 "result": result
-            }
-            
-            print(json.dumps(response))
-            sys.stdout.flush()
+            })
             
         except Exception as e:
-            logger.error(f"Error in main loop: {e}")
+            logger.error("Error handling request: %s", e)
             if 'request_id' in locals():
-                error_response = {
+                self.send_message({
                     "jsonrpc": "2.0",
                     "id": request_id,
                     "error": {"code": -32603, "message": f"Internal error: {str(e)}"}
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+                })
+    
+    def send_message(self, message: Dict[str, Any]) -> None:
+        """Write one complete response frame to stdout"""
+        write_all(self.stdout, _dumps_line(message))
+
+async def main():
+    """Main MCP server loop"""
+    # Responses are written whole by write_all, so skip the text and buffer layers
+    stdout = io.FileIO(sys.stdout.fileno(), 'w', closefd=False)
+    server = EnhancedYouTubeMCPServer(stdout)
+    
+    logger.info("Starting Enhanced YouTube MCP Server...")
+    
+    read_line = await stdin_line_reader(STDIN_LINE_LIMIT)
+    
+    # The reader only queues lines; workers handle them concurrently, so a slow
+    # tool call no longer holds up the requests behind it. Responses carry their
+    # id and may go out in a different order than the requests arrived.
+    queue: "asyncio.Queue[bytes]" = asyncio.Queue()
+    workers = [asyncio.create_task(request_worker(server, queue)) for _ in range(REQUEST_WORKERS)]
+    
+    while True:
+        try:
+            line = await read_line()
+        except ValueError as e:
+            # Line longer than STDIN_LINE_LIMIT; the reader has already discarded it
+            logger.error("Error reading stdin: %s", e)
+            continue
+        
+        if not line:
+            break
+        
+        line = line.strip()
+        if line:
+            queue.put_nowait(line)
+    
+    # Finish requests already received before exiting on EOF
+    await queue.join()
+    for worker in workers:
+        worker.cancel()
 
 if __name__ == "__main__":
     asyncio.run(main())